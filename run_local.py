@@ -7,6 +7,7 @@ Run this to test the app locally before Docker deployment.
 import os
 import sys
 import logging
+from importlib.util import find_spec
 from pathlib import Path
 
 # Add src to Python path
@@ -23,33 +24,27 @@ os.environ.setdefault("PYTHONPATH", str(src_path))
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# (module name, pip package name, display name)
+REQUIRED_DEPENDENCIES = [
+    ("fastapi", "fastapi", "FastAPI"),
+    ("uvicorn", "uvicorn", "Uvicorn"),
+    ("strawberry", "strawberry-graphql", "Strawberry GraphQL"),
+    ("pydantic", "pydantic", "Pydantic"),
+]
+
 def check_dependencies():
-    """Check if required dependencies are available."""
-    missing_deps = []
-    
-    try:
-        import fastapi
-        logger.info("✅ FastAPI available")
-    except ImportError:
-        missing_deps.append("fastapi")
-    
-    try:
-        import uvicorn
-        logger.info("✅ Uvicorn available")
-    except ImportError:
-        missing_deps.append("uvicorn")
+    """Check if required dependencies are available.
     
-    try:
-        import strawberry
-        logger.info("✅ Strawberry GraphQL available")
-    except ImportError:
-        missing_deps.append("strawberry-graphql")
+    Uses find_spec so the packages are located without executing their
+    module-level import code.
+    """
+    missing_deps = []
     
-    try:
-        import pydantic
-        logger.info("✅ Pydantic available")
-    except ImportError:
-        missing_deps.append("pydantic")
+    for module_name, package_name, display_name in REQUIRED_DEPENDENCIES:
+        if find_spec(module_name) is None:
+            missing_deps.append(package_name)
+        else:
+            logger.info(f"✅ {display_name} available")
     
     if missing_deps:
         logger.error(f"❌ Missing dependencies: {', '.join(missing_deps)}")
@@ -66,13 +61,15 @@ def run_app():
         logger.error("❌ Cannot start - missing dependencies")
         return 1
     
+    # Only pay for the server import once the dependency check has passed
+    import uvicorn
+    
     try:
         # Import the app
         from ast_viewer.api.main import app
         logger.info("✅ FastAPI app imported successfully")
         
         # Start with uvicorn
-        import uvicorn
         logger.info("🎯 Starting development server on http://localhost:8001")
         logger.info("📚 API docs will be available at http://localhost:8001/docs")
         logger.info("🔍 GraphQL playground at http://localhost:8001/graphql")
@@ -27,8 +27,10 @@ Examples:
 
 import sys
 import os
+import shutil
 import subprocess
 import argparse
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -56,10 +58,9 @@ def check_dependencies():
     required_packages = ["pytest", "pytest-cov", "pytest-asyncio"]
     missing = []
     
+    # find_spec locates the package without executing its import-time code
     for package in required_packages:
-        try:
-            __import__(package.replace("-", "_"))
-        except ImportError:
+        if find_spec(package.replace("-", "_")) is None:
             missing.append(package)
     
     if missing:
@@ -151,10 +152,8 @@ def run_tdd_mode(watch_dir="src/", verbose=False):
     if verbose:
         cmd.append("--verbose")
     
-    # Check if pytest-watch is installed
-    try:
-        subprocess.run(["ptw", "--help"], capture_output=True)
-    except FileNotFoundError:
+    # Check if pytest-watch is installed (PATH lookup, no subprocess)
+    if shutil.which("ptw") is None:
         print("❌ pytest-watch not found. Install with: pip install pytest-watch")
         return False
     
@@ -175,10 +174,15 @@ def setup_test_environment():
         "tests/unit"
     ]
     
-    for dir_path in test_dirs:
-        Path(dir_path).mkdir(parents=True, exist_ok=True)
+    # One stat per directory; only missing ones are created (parents included)
+    missing_dirs = [dir_path for dir_path in test_dirs if not os.path.isdir(dir_path)]
+    for dir_path in missing_dirs:
+        os.makedirs(dir_path, exist_ok=True)
         print(f"📁 Created directory: {dir_path}")
     
+    if not missing_dirs:
+        print("📁 Test directories already present")
+    
     # Set environment variables for testing
     os.environ["TESTING"] = "true"
     os.environ["PYTHONPATH"] = str(Path.cwd() / "src")
@@ -5,6 +5,9 @@ A unified implementation for multi-language code analysis that bridges
 AST analyzer (Python-specific) with ProjectBuilder (multi-language).
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from .models.universal import (
     ElementType,
     Language,
@@ -20,9 +23,10 @@ from .models.universal import (
     CallGraphNode,
 )
 
-from .analyzers.universal import UniversalAnalyzer
-from .analyzers.integrated import IntegratedCodeAnalyzer
-from .analyzers.intelligence import IntelligenceEngine
+if TYPE_CHECKING:
+    from .analyzers.universal import UniversalAnalyzer
+    from .analyzers.integrated import IntegratedCodeAnalyzer
+    from .analyzers.intelligence import IntelligenceEngine
 
 __version__ = "0.2.0"  # Upgraded to v0.2.0 with intelligence features
 __all__ = [
@@ -47,3 +51,20 @@ __all__ = [
     "IntegratedCodeAnalyzer",
     "IntelligenceEngine",
 ]
+
+# Analyzers pull in tree-sitter, NetworkX and the visualization stack, so they
+# are imported on first attribute access (PEP 562) rather than at package import.
+_LAZY_IMPORTS = {
+    "UniversalAnalyzer": ".analyzers.universal",
+    "IntegratedCodeAnalyzer": ".analyzers.integrated",
+    "IntelligenceEngine": ".analyzers.intelligence",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
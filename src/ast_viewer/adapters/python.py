@@ -2,8 +2,12 @@
 
 import ast
 import logging
+import re
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
 
 from ..models.universal import (
     ElementType,
@@ -12,62 +16,274 @@ from ..models.universal import (
     UniversalNode,
     UniversalFile,
 )
+from ..common.disk_cache import DiskCache
 from ..common.identifiers import IDGenerator
 from ..common.errors import handle_errors, analysis_operation
-from ..common.metrics import ComplexityCalculator
+from ..common.metrics import DECISION_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
+# Exact AST class -> universal element type (ast node classes are never subclassed)
+_AST_TYPE_MAP: Dict[type, ElementType] = {
+    ast.Module: ElementType.MODULE,
+    ast.ClassDef: ElementType.CLASS,
+    ast.FunctionDef: ElementType.FUNCTION,
+    ast.AsyncFunctionDef: ElementType.FUNCTION,
+    ast.Assign: ElementType.VARIABLE,
+    ast.AnnAssign: ElementType.VARIABLE,
+    ast.Import: ElementType.IMPORT,
+    ast.ImportFrom: ElementType.IMPORT,
+    ast.If: ElementType.CONDITIONAL,
+    ast.For: ElementType.LOOP,
+    ast.While: ElementType.LOOP,
+    ast.Try: ElementType.EXCEPTION,
+    ast.Lambda: ElementType.LAMBDA,
+    ast.GeneratorExp: ElementType.GENERATOR,
+}
+
+# Start of a line whose first non-blank character is not a comment marker
+_CODE_LINE_RE = re.compile(rb'^[ \t\f\v]*[^#\s]', re.MULTILINE)
+
+
+def _decision_node_types() -> frozenset:
+    """AST classes counted as decision points by the cyclomatic complexity metric."""
+    decision_types = set()
+    pending = [ast.AST]
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        name = cls.__name__.lower()
+        if any(keyword in name for keyword in DECISION_KEYWORDS):
+            decision_types.add(cls)
+    return frozenset(decision_types)
+
+
+_DECISION_NODE_TYPES = _decision_node_types()
+
+# Attribute holding the name of named AST nodes
+_NAME_ATTR: Dict[type, str] = {
+    ast.FunctionDef: 'name',
+    ast.AsyncFunctionDef: 'name',
+    ast.ClassDef: 'name',
+    ast.Name: 'id',
+    ast.arg: 'arg',
+    ast.Attribute: 'attr',
+}
+
+# Attribute holding the referenced name for decorator expressions
+_DECORATOR_NAME_ATTR: Dict[type, str] = {
+    ast.Name: 'id',
+    ast.Attribute: 'attr',
+}
+
+
+# Adapter reused by parse_files() worker processes (one per process)
+_worker_adapter: Optional['PythonAdapter'] = None
+
+
+def _parse_one(item: Tuple[Path, str]) -> Optional[UniversalFile]:
+    """Parse a single (path, content) pair inside a worker process."""
+    global _worker_adapter
+    if _worker_adapter is None:
+        _worker_adapter = PythonAdapter()
+    file_path, content = item
+    return _worker_adapter.parse_file(file_path, content)
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    """Single-pass traversal collecting nodes, imports and function complexities.
+    
+    Universal nodes are only emitted while every ancestor was itself mapped to a
+    universal node, matching the original stack-based extraction. Imports and
+    function complexities are collected from the whole tree.
+    """
+    
+    def __init__(self, adapter: 'PythonAdapter', file_path: str):
+        self.adapter = adapter
+        self.file_path = file_path
+        self.nodes: List[UniversalNode] = []
+        self.imports: List[str] = []
+        self.func_complexities: List[float] = []
+        # Innermost universal node per level; None once below an unmapped node
+        self._node_stack: List[Optional[UniversalNode]] = []
+        self._current: Optional[UniversalNode] = None
+        # Decision points seen so far inside each enclosing function
+        self._complexity_stack: List[int] = []
+    
+    def visit(self, node: ast.AST) -> None:
+        if self._complexity_stack and type(node) in _DECISION_NODE_TYPES:
+            self._complexity_stack[-1] += 1
+        
+        universal_node = None
+        if not self._node_stack:
+            universal_node = self.adapter._create_universal_node(node, self.file_path, None)
+        elif self._node_stack[-1] is not None:
+            universal_node = self.adapter._create_universal_node(
+                node, self.file_path, self._node_stack[-1].id
+            )
+        if universal_node:
+            self.nodes.append(universal_node)
+        
+        self._current = universal_node
+        self._node_stack.append(universal_node)
+        super().visit(node)
+        self._node_stack.pop()
+    
+    def generic_visit(self, node: ast.AST) -> None:
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+    
+    def visit_Constant(self, node: ast.Constant) -> None:
+        # Leaf node; skips NodeVisitor's lookup of deprecated visit_Num/visit_Str handlers
+        pass
+    
+    def _visit_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        universal_node = self._current
+        self._complexity_stack.append(0)
+        self.generic_visit(node)
+        decisions = self._complexity_stack.pop()
+        if self._complexity_stack:
+            # Enclosing functions include the nested function's decision points
+            self._complexity_stack[-1] += decisions
+        
+        complexity = float(1 + decisions)
+        if universal_node:
+            universal_node.complexity = complexity
+        self.func_complexities.append(complexity)
+    
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+    
+    # Import children are only alias nodes, which never yield universal nodes,
+    # imports or decision points, so they are not descended into.
+    def visit_Import(self, node: ast.Import) -> None:
+        self.imports.extend(alias.name for alias in node.names)
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module
+        if module:
+            self.imports.extend(sys.intern(f"{module}.{alias.name}") for alias in node.names)
+        else:
+            self.imports.extend(alias.name for alias in node.names)
+
 
 class PythonAdapter:
     """Adapter for Python AST to Universal model."""
     
+    def __init__(self, cache_size: int = 512):
+        """
+        Initialize adapter with a per-instance parse cache.
+        
+        Args:
+            cache_size: Maximum number of parsed files kept in the LRU cache,
+                        keyed by file path and content hash (0 disables caching)
+        
+        Parse results are also persisted across runs when AST_VIEWER_CACHE_DIR
+        is set (see common.disk_cache).
+        """
+        self.cache_size = cache_size
+        self._parse_cache: "OrderedDict[Tuple[str, str], UniversalFile]" = OrderedDict()
+        self._disk_cache = DiskCache.from_env("python")
+    
     @analysis_operation(default_return=None)
     def parse_file(self, file_path: Path, content: str) -> UniversalFile:
         """Parse Python file into universal format."""
-        tree = ast.parse(content, filename=str(file_path))
+        encoded = content.encode('utf-8')
+        content_hash = IDGenerator.generate_file_hash(encoded)
+        cache_key = (str(file_path), content_hash)
+        
+        cached = self._parse_cache.get(cache_key)
+        if cached is not None:
+            self._parse_cache.move_to_end(cache_key)
+            return self._copy_cached(cached)
+        
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(*cache_key)
+            if cached is not None:
+                return self._remember(cache_key, cached)
+        
+        # Structure only: never tokenize type comments. feature_version is left at
+        # the running interpreter's grammar so newer syntax keeps parsing.
+        tree = ast.parse(content, filename=str(file_path), type_comments=False)
+        lines = content.splitlines()
         
         universal_file = UniversalFile(
             path=str(file_path),
             language=Language.PYTHON,
             encoding='utf-8',
-            size_bytes=len(content.encode('utf-8')),
-            hash=IDGenerator.generate_file_hash(content),
-            total_lines=len(content.splitlines())
+            size_bytes=len(encoded),
+            hash=content_hash,
+            total_lines=len(lines)
         )
         
-        # Extract nodes
-        nodes = self.extract_nodes(tree, str(file_path))
-        for node in nodes:
-            universal_file.add_node(node)
+        # Extract nodes, imports and function complexities in a single traversal
+        visitor = _PythonVisitor(self, str(file_path))
+        visitor.visit(tree)
+        universal_file.extend_nodes(visitor.nodes)
         
-        # Extract imports
-        universal_file.imports = self._extract_imports(tree)
+        universal_file.imports = visitor.imports
         
         # Calculate metrics
-        universal_file.complexity = self._calculate_complexity(tree)
-        universal_file.code_lines = self._count_code_lines(content)
+        complexities = visitor.func_complexities
+        universal_file.complexity = sum(complexities) / len(complexities) if complexities else 1.0
+        universal_file.code_lines = self._count_code_lines(encoded)
+        
+        if self._disk_cache is not None:
+            self._disk_cache.put(universal_file, *cache_key)
         
-        return universal_file
+        return self._remember(cache_key, universal_file)
     
-    def extract_nodes(self, tree: ast.AST, file_path: str) -> List[UniversalNode]:
-        """Extract universal nodes from Python AST."""
-        nodes = []
-        node_stack = [(tree, None)]  # (node, parent_id)
+    def parse_files(self, items: List[Tuple[Path, str]], *,
+                    workers: Optional[int] = None) -> List[Optional[UniversalFile]]:
+        """Parse many files, fanning out across processes.
         
-        while node_stack:
-            node, parent_id = node_stack.pop()
-            
-            # Create universal node
-            universal_node = self._create_universal_node(node, file_path, parent_id)
-            if universal_node:
-                nodes.append(universal_node)
-                
-                # Add children to stack
-                for child in ast.iter_child_nodes(node):
-                    node_stack.append((child, universal_node.id))
+        Parsing is CPU-bound and holds the GIL, so bulk analysis scales with a
+        process pool. Results keep the input order; files that fail to parse
+        yield None, as with parse_file.
+        
+        Args:
+            items: (file_path, content) pairs to parse
+            workers: Maximum worker processes (defaults to the CPU count);
+                     1 parses serially in this process
+        """
+        if workers == 1 or len(items) < 2:
+            return [self.parse_file(file_path, content) for file_path, content in items]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_one, items, chunksize=16))
+    
+    def clear_cache(self) -> None:
+        """Drop all cached parse results."""
+        self._parse_cache.clear()
+    
+    def _remember(self, cache_key: Tuple[str, str], universal_file: UniversalFile) -> UniversalFile:
+        """Store a parse result in the LRU cache and return the caller's copy."""
+        if self.cache_size <= 0:
+            return universal_file
+        
+        self._parse_cache[cache_key] = universal_file
+        if len(self._parse_cache) > self.cache_size:
+            self._parse_cache.popitem(last=False)
+        return self._copy_cached(universal_file)
+    
+    @staticmethod
+    def _copy_cached(universal_file: UniversalFile) -> UniversalFile:
+        """Return a copy whose file-level containers can be mutated by the caller.
         
-        return nodes
+        Nodes are shared with the cache and must be treated as read-only.
+        """
+        return universal_file.model_copy(update={
+            'nodes': list(universal_file.nodes),
+            'imports': list(universal_file.imports),
+            'exports': list(universal_file.exports),
+            'metadata': dict(universal_file.metadata),
+        })
+    
+    def extract_nodes(self, tree: ast.AST, file_path: str) -> List[UniversalNode]:
+        """Extract universal nodes from Python AST."""
+        visitor = _PythonVisitor(self, file_path)
+        visitor.visit(tree)
+        return visitor.nodes
     
     def _create_universal_node(self, node: ast.AST, file_path: str, 
                                parent_id: Optional[str]) -> Optional[UniversalNode]:
@@ -90,8 +306,7 @@ class PythonAdapter:
             name=name,
             language=Language.PYTHON,
             location=location,
-            parent_id=parent_id,
-            raw_node=node
+            parent_id=parent_id
         )
         
         # Add Python-specific properties
@@ -101,35 +316,15 @@ class PythonAdapter:
     
     def _map_node_type(self, node: ast.AST) -> Optional[ElementType]:
         """Map Python AST node to universal element type."""
-        mapping = {
-            ast.Module: ElementType.MODULE,
-            ast.ClassDef: ElementType.CLASS,
-            ast.FunctionDef: ElementType.FUNCTION,
-            ast.AsyncFunctionDef: ElementType.FUNCTION,
-            ast.Assign: ElementType.VARIABLE,
-            ast.AnnAssign: ElementType.VARIABLE,
-            ast.Import: ElementType.IMPORT,
-            ast.ImportFrom: ElementType.IMPORT,
-            ast.If: ElementType.CONDITIONAL,
-            ast.For: ElementType.LOOP,
-            ast.While: ElementType.LOOP,
-            ast.Try: ElementType.EXCEPTION,
-            ast.Lambda: ElementType.LAMBDA,
-            ast.GeneratorExp: ElementType.GENERATOR,
-        }
-        
-        for ast_type, element_type in mapping.items():
-            if isinstance(node, ast_type):
-                return element_type
-        return None
+        return _AST_TYPE_MAP.get(type(node))
     
     def _extract_node_name(self, node: ast.AST) -> Optional[str]:
         """Extract name from Python AST node."""
-        for attr in ['name', 'id', 'arg', 'attr']:
-            if hasattr(node, attr):
-                return str(getattr(node, attr))
+        attr = _NAME_ATTR.get(type(node))
+        if attr:
+            return getattr(node, attr)
         
-        if isinstance(node, ast.Assign) and node.targets:
+        if type(node) is ast.Assign and node.targets:
             target = node.targets[0]
             if isinstance(target, ast.Name):
                 return target.id
@@ -142,7 +337,6 @@ class PythonAdapter:
             universal_node.is_async = isinstance(ast_node, ast.AsyncFunctionDef)
             universal_node.parameters = self._extract_parameters(ast_node)
             universal_node.return_type = self._extract_return_type(ast_node)
-            universal_node.complexity = self._calculate_node_complexity(ast_node)
             
             # Check for decorators
             if ast_node.decorator_list:
@@ -174,24 +368,29 @@ class PythonAdapter:
                 'default': None
             }
             if arg.annotation:
-                param['type'] = ast.unparse(arg.annotation) if hasattr(ast, 'unparse') else str(arg.annotation)
+                param['type'] = self._unparse_annotation(arg.annotation)
             params.append(param)
         return params
     
     def _extract_return_type(self, func_node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> Optional[str]:
         """Extract function return type."""
         if func_node.returns:
-            return ast.unparse(func_node.returns) if hasattr(ast, 'unparse') else str(func_node.returns)
+            return self._unparse_annotation(func_node.returns)
         return None
     
-    def _calculate_node_complexity(self, node: ast.AST) -> float:
-        """Calculate cyclomatic complexity for a node using centralized calculator."""
-        # Convert AST node to data format expected by ComplexityCalculator
-        node_data = {
-            'type': node.__class__.__name__.lower(),
-            'children': [{'type': child.__class__.__name__.lower()} for child in ast.walk(node)]
-        }
-        return ComplexityCalculator.calculate_cyclomatic_complexity(node_data)
+    def _unparse_annotation(self, annotation: ast.AST) -> str:
+        """Render a type annotation as source text.
+        
+        Plain and dotted names (the bulk of real-world annotations) are built
+        directly; anything else goes through ast.unparse. Built strings are
+        interned since the same annotations recur throughout a codebase.
+        """
+        current = annotation
+        while type(current) is ast.Attribute:
+            current = current.value
+        if type(current) is ast.Name:
+            return self._get_base_name(annotation)
+        return sys.intern(ast.unparse(annotation))
     
     def _generate_node_id(self, node: ast.AST, location: SourceLocation) -> str:
         """Generate unique node ID."""
@@ -202,53 +401,26 @@ class PythonAdapter:
             node.__class__.__name__
         )
     
-    def _extract_imports(self, tree: ast.AST) -> List[str]:
-        """Extract import statements."""
-        imports = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    imports.append(alias.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ''
-                for alias in node.names:
-                    imports.append(f"{module}.{alias.name}" if module else alias.name)
-        return imports
-    
-    def _calculate_complexity(self, tree: ast.AST) -> float:
-        """Calculate average complexity for file."""
-        complexities = []
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                complexities.append(self._calculate_node_complexity(node))
-        return sum(complexities) / len(complexities) if complexities else 1.0
-    
-    def _count_code_lines(self, content: str) -> int:
-        """Count actual code lines (non-blank, non-comment)."""
-        code_lines = 0
-        for line in content.splitlines():
-            stripped = line.strip()
-            if stripped and not stripped.startswith('#'):
-                code_lines += 1
-        return code_lines
+    def _count_code_lines(self, encoded: bytes) -> int:
+        """Count actual code lines (non-blank, non-comment) in UTF-8 source."""
+        return len(_CODE_LINE_RE.findall(encoded))
     
     def _get_decorator_name(self, decorator: ast.AST) -> str:
         """Extract decorator name."""
-        if isinstance(decorator, ast.Name):
-            return decorator.id
-        elif isinstance(decorator, ast.Attribute):
-            return decorator.attr
-        elif isinstance(decorator, ast.Call):
-            if isinstance(decorator.func, ast.Name):
-                return decorator.func.id
-            elif isinstance(decorator.func, ast.Attribute):
-                return decorator.func.attr
+        target = decorator.func if type(decorator) is ast.Call else decorator
+        attr = _DECORATOR_NAME_ATTR.get(type(target))
+        if attr:
+            return getattr(target, attr)
         return str(decorator)
     
     def _get_base_name(self, base: ast.AST) -> str:
-        """Extract base class name."""
-        if isinstance(base, ast.Name):
-            return base.id
-        elif isinstance(base, ast.Attribute):
-            return f"{self._get_base_name(base.value)}.{base.attr}"
-        return str(base)
+        """Extract (dotted) base class name."""
+        parts = []
+        current = base
+        while type(current) is ast.Attribute:
+            parts.append(current.attr)
+            current = current.value
+        parts.append(current.id if type(current) is ast.Name else str(current))
+        if len(parts) == 1:
+            return parts[0]
+        return sys.intern('.'.join(reversed(parts)))
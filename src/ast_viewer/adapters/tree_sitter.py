@@ -1,9 +1,12 @@
 """Tree-sitter adapter for multi-language code analysis."""
 
 import logging
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Set
-from collections import defaultdict
+from typing import Dict, FrozenSet, Iterator, List, Optional, Any, Set, Tuple
+from collections import defaultdict, OrderedDict
 
 try:
     import tree_sitter
@@ -17,18 +20,240 @@ from ..models.universal import (
     UniversalNode,
     UniversalFile,
 )
+from ..common.disk_cache import DiskCache
+from ..common.errors import handle_errors
 from ..common.identifiers import IDGenerator
-from ..common.metrics import ComplexityCalculator
+from ..common.metrics import ComplexityCalculator, is_decision_type
 
 logger = logging.getLogger(__name__)
 
+# Line prefixes treated as comments across the supported languages
+_COMMENT_MARKERS = ('#', '//', '/*', '*', '<!--', '--', '///', '##')
+
+# Start of a line whose first non-blank character does not begin a comment marker
+_CODE_LINE_RE = re.compile(
+    rb'^[ \t]*(?!' + b'|'.join(re.escape(marker.encode()) for marker in _COMMENT_MARKERS)
+    + rb')[^\s]',
+    re.MULTILINE
+)
+
+# Maps the other ASCII characters str.splitlines() breaks on to b'\n' (and the
+# remaining ASCII whitespace to a space) so _CODE_LINE_RE sees the same lines
+_LINE_BREAK_TRANSLATION = bytes.maketrans(b'\r\v\f\x1c\x1d\x1e\x1f', b'\n\n\n\n\n\n ')
+
+# Above this share of changed bytes a fresh parse is cheaper than an edit
+_MAX_INCREMENTAL_CHANGE_RATIO = 0.5
+
+
+def _common_prefix_length(a: bytes, b: bytes) -> int:
+    """Length of the common prefix of two byte strings (binary search over memcmp)."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix_length(a: bytes, b: bytes, limit: int) -> int:
+    """Length of the common suffix of two byte strings, capped at ``limit``."""
+    low, high = 0, limit
+    len_a, len_b = len(a), len(b)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len_a - mid:len_a - low] == b[len_b - mid:len_b - low]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _point_at(content: bytes, offset: int) -> Tuple[int, int]:
+    """Tree-sitter (row, byte column) point for a byte offset."""
+    row = content.count(b'\n', 0, offset)
+    return row, offset - (content.rfind(b'\n', 0, offset) + 1)
+
+
+_NAME_NODE_TYPES = frozenset({"identifier", "type_identifier", "property_identifier", "field_identifier"})
+_PARAM_LIST_NODE_TYPES = frozenset({"parameters", "parameter_list", "formal_parameters"})
+_STRING_LITERAL_NODE_TYPES = frozenset({"string", "interpreted_string_literal", "raw_string_literal"})
+_TYPE_NODE_TYPES = frozenset({"type", "type_annotation", "type_identifier", "primitive_type"})
+_NESTING_NODE_TYPES = frozenset({
+    "if_statement", "while_statement", "for_statement", "function_definition", "method_definition"
+})
+# Keywords are matched on the words of a modifier node's ASCII-lowercased
+# source bytes and map to their string form
+_MODIFIER_KEYWORDS = {keyword.encode(): keyword for keyword in (
+    "static", "async", "abstract", "final", "sealed",
+    "const", "readonly", "public", "private", "protected"
+)}
+_VISIBILITY_KEYWORDS = {keyword.encode(): keyword for keyword in (
+    "public", "private", "protected", "internal", "package"
+)}
+_VISIBILITY_KEYWORDS[b"pub"] = "public"  # Rust
+# Node types that carry modifiers as direct children of a declaration
+_MODIFIER_NODE_TYPES: Dict[Language, FrozenSet[str]] = {
+    Language.PYTHON: frozenset({"async"}),
+    Language.JAVASCRIPT: frozenset({"async", "static"}),
+    Language.TYPESCRIPT: frozenset({"async", "static", "abstract", "readonly", "accessibility_modifier"}),
+    Language.GO: frozenset({"const"}),
+    Language.RUST: frozenset({"visibility_modifier", "function_modifiers"}),
+}
+
+# Tree-sitter node types mapped to ElementTypes, per language
+_SYMBOL_TYPES: Dict[Language, Dict[str, ElementType]] = {
+    Language.PYTHON: {
+        "class_definition": ElementType.CLASS,
+        "function_definition": ElementType.FUNCTION,
+        "assignment": ElementType.VARIABLE,
+        "import_statement": ElementType.IMPORT,
+        "import_from_statement": ElementType.IMPORT,
+    },
+    Language.JAVASCRIPT: {
+        "class_declaration": ElementType.CLASS,
+        "function_declaration": ElementType.FUNCTION,
+        "method_definition": ElementType.METHOD,
+        "variable_declarator": ElementType.VARIABLE,
+        "import_statement": ElementType.IMPORT,
+        "export_statement": ElementType.EXPORT,
+    },
+    Language.TYPESCRIPT: {
+        "class_declaration": ElementType.CLASS,
+        "interface_declaration": ElementType.INTERFACE,
+        "function_declaration": ElementType.FUNCTION,
+        "method_definition": ElementType.METHOD,
+        "variable_declarator": ElementType.VARIABLE,
+        "type_alias_declaration": ElementType.CLASS,
+        "import_statement": ElementType.IMPORT,
+        "export_statement": ElementType.EXPORT,
+    },
+    Language.GO: {
+        "type_declaration": ElementType.CLASS,
+        "function_declaration": ElementType.FUNCTION,
+        "method_declaration": ElementType.METHOD,
+        "var_declaration": ElementType.VARIABLE,
+        "const_declaration": ElementType.CONSTANT,
+        "import_declaration": ElementType.IMPORT,
+    },
+    Language.RUST: {
+        "struct_item": ElementType.STRUCT,
+        "enum_item": ElementType.ENUM,
+        "trait_item": ElementType.TRAIT,
+        "function_item": ElementType.FUNCTION,
+        "impl_item": ElementType.CLASS,
+        "use_declaration": ElementType.IMPORT,
+    },
+}
+
+
+# (element type, is name, is parameter list, is decision, is nesting, is modifier)
+_NodeKind = Tuple[Optional[ElementType], bool, bool, bool, bool, bool]
+
+
+def _classify_node_type(node_type: str, symbol_types: Dict[str, ElementType],
+                        modifier_types: FrozenSet[str]) -> _NodeKind:
+    """Classify a node type once for the tree walk."""
+    return (
+        symbol_types.get(node_type),
+        node_type in _NAME_NODE_TYPES,
+        node_type in _PARAM_LIST_NODE_TYPES,
+        is_decision_type(node_type),
+        node_type in _NESTING_NODE_TYPES,
+        node_type in modifier_types,
+    )
+
+
+def _read_modifier_node(node: Any, modifiers: Set[str]) -> Optional[str]:
+    """Add the modifier keywords spelled by a modifier node; return its visibility keyword."""
+    visibility = None
+    for word in node.text.lower().split():
+        modifier = _MODIFIER_KEYWORDS.get(word)
+        if modifier:
+            modifiers.add(modifier)
+        if visibility is None:
+            visibility = _VISIBILITY_KEYWORDS.get(word)
+    return visibility
+
+
+def _walk_subtree(node: Any) -> Iterator[Tuple[Any, int]]:
+    """Yield ``(node, depth)`` for a subtree in pre-order using a single TreeCursor."""
+    cursor = node.walk()
+    depth = 0
+    while True:
+        yield cursor.node, depth
+        if cursor.goto_first_child():
+            depth += 1
+            continue
+        while depth and not cursor.goto_next_sibling():
+            cursor.goto_parent()
+            depth -= 1
+        if not depth:
+            return
+
+
+# Adapter reused by parse_files() worker processes (one per process)
+_worker_adapter: Optional['TreeSitterAdapter'] = None
+
+
+@handle_errors(default_return=None, custom_message="Failed to read and parse file")
+def _read_and_parse(adapter: 'TreeSitterAdapter', file_path: Path) -> Optional[UniversalFile]:
+    """Read a file's bytes and parse them with the given adapter."""
+    return adapter.parse_bytes(file_path, Path(file_path).read_bytes())
+
+
+def _parse_one(file_path: Path) -> Optional[UniversalFile]:
+    """Read and parse a single file inside a worker process."""
+    global _worker_adapter
+    if _worker_adapter is None:
+        # Workers see each path once, so keeping old trees would only cost memory
+        _worker_adapter = TreeSitterAdapter(tree_cache_size=0)
+    return _read_and_parse(_worker_adapter, file_path)
+
+
+class _SymbolScan:
+    """Facts about a symbol gathered while the walk is inside its subtree."""
+    
+    __slots__ = ("node", "element_type", "depth", "nesting_level", "name",
+                 "modifiers", "visibility", "param_list", "decision_children")
+    
+    def __init__(self, node: Any, element_type: ElementType, depth: int, nesting_level: int):
+        self.node = node
+        self.element_type = element_type
+        self.depth = depth
+        self.nesting_level = nesting_level
+        self.name: Optional[str] = None
+        self.modifiers: Set[str] = set()
+        self.visibility: Optional[str] = None
+        self.param_list: Any = None
+        self.decision_children = 0
+
 
 class TreeSitterAdapter:
     """Multi-language adapter using Tree-sitter."""
     
-    def __init__(self):
+    def __init__(self, tree_cache_size: int = 128, keep_raw_nodes: bool = False):
+        """
+        Initialize parsers for all available languages.
+        
+        Args:
+            tree_cache_size: Maximum number of previous syntax trees kept for
+                             incremental re-parsing, keyed by file path (0 disables)
+            keep_raw_nodes: Store the Tree-sitter node on each UniversalNode's
+                            ``raw_node``; this keeps the whole syntax tree alive
+                            for as long as any extracted node is referenced
+        
+        Parse results are also persisted across runs when AST_VIEWER_CACHE_DIR
+        is set (see common.disk_cache), unless raw nodes are kept.
+        """
         self.parsers: Dict[Language, tree_sitter.Parser] = {}
-        self.query_cache: Dict[str, tree_sitter.Query] = {}
+        self.tree_cache_size = tree_cache_size
+        self.keep_raw_nodes = keep_raw_nodes
+        # Tree-sitter nodes cannot be pickled
+        self._disk_cache = None if keep_raw_nodes else DiskCache.from_env("tree_sitter")
+        self._tree_cache: "OrderedDict[str, Tuple[Language, bytes, tree_sitter.Tree]]" = OrderedDict()
+        self._node_kinds: Dict[Language, Dict[int, _NodeKind]] = {}
         self._init_parsers()
     
     def _init_parsers(self):
@@ -50,292 +275,247 @@ class TreeSitterAdapter:
     
     def parse_file(self, file_path: Path, content: str) -> UniversalFile:
         """Parse file using Tree-sitter."""
+        return self.parse_bytes(file_path, content.encode('utf-8'))
+    
+    def parse_bytes(self, file_path: Path, content_bytes: bytes) -> UniversalFile:
+        """Parse UTF-8 encoded file content using Tree-sitter.
+        
+        Callers that already hold the raw bytes avoid decoding and re-encoding
+        the source; nothing here needs it as str.
+        """
         # Detect language
         language = self._detect_language(file_path)
         
         if language not in self.parsers:
             raise ValueError(f"No Tree-sitter parser available for {language.value}")
         
+        # One interned path string is shared by the file, every node location
+        # and every other file object that refers to the same path
+        path = sys.intern(str(file_path))
+        content_hash = IDGenerator.generate_file_hash(content_bytes)
+        
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(path, content_hash)
+            if cached is not None:
+                return cached
+        
         try:
             # Parse with Tree-sitter
-            content_bytes = content.encode('utf-8')
-            parser = self.parsers[language]
-            tree = parser.parse(content_bytes)
+            tree = self._parse_tree(path, language, content_bytes)
+            total_lines, code_lines = self._count_lines(content_bytes)
             
             # Create universal file
             universal_file = UniversalFile(
-                path=str(file_path),
+                path=path,
                 language=language,
                 encoding='utf-8',
                 size_bytes=len(content_bytes),
-                hash=IDGenerator.generate_file_hash(content_bytes),
-                total_lines=len(content.splitlines())
+                hash=content_hash,
+                total_lines=total_lines
             )
             
             # Extract symbols/nodes
-            nodes = self.extract_nodes(tree, content_bytes, str(file_path), language)
-            for node in nodes:
-                universal_file.add_node(node)
+            nodes = self.extract_nodes(tree, content_bytes, path, language)
+            universal_file.extend_nodes(nodes)
             
-            # Extract imports/exports
-            universal_file.imports = self._extract_imports(tree, content_bytes, language)
-            universal_file.exports = self._extract_exports(tree, content_bytes, language)
+            # Imports/exports come from the IMPORT/EXPORT nodes found above
+            universal_file.imports, universal_file.exports = self._collect_imports_exports(
+                nodes, tree, content_bytes, language
+            )
             
             # Calculate metrics
-            universal_file.code_lines = self._count_code_lines(content)
+            universal_file.code_lines = code_lines
             universal_file.complexity = self._calculate_file_complexity(nodes)
             
+            if self._disk_cache is not None:
+                self._disk_cache.put(universal_file, path, content_hash)
+            
             return universal_file
             
         except Exception as e:
             logger.error(f"Failed to parse {file_path} with Tree-sitter: {e}")
             raise
     
-    def extract_nodes(self, tree: tree_sitter.Tree, content: bytes, 
-                     file_path: str, language: Language) -> List[UniversalNode]:
-        """Extract nodes from Tree-sitter tree using both queries and tree walking."""
-        nodes = []
+    def parse_files(self, paths: List[Path], *,
+                    workers: Optional[int] = None) -> List[Optional[UniversalFile]]:
+        """Read and parse many files, fanning out across processes.
+        
+        Parsers and queries cannot be pickled, so each worker process builds
+        its own adapter and reads the files itself; only paths and results
+        cross the process boundary. Results keep the input order and files
+        that cannot be read or parsed yield None. Workers never keep
+        ``raw_node``, whatever ``keep_raw_nodes`` is set to.
+        
+        Args:
+            paths: Files to parse
+            workers: Maximum worker processes (defaults to the CPU count);
+                     1 parses serially in this process
+        """
+        if workers == 1 or len(paths) < 2:
+            return [_read_and_parse(self, file_path) for file_path in paths]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_one, paths, chunksize=16))
+    
+    def invalidate(self, file_path: Path) -> None:
+        """Forget the cached syntax tree of a file so its next parse starts fresh."""
+        self._tree_cache.pop(str(file_path), None)
+    
+    def _parse_tree(self, file_path: str, language: Language, content_bytes: bytes) -> tree_sitter.Tree:
+        """Parse content, reusing the previous tree of the same file when possible.
+        
+        The change between the cached and the new content is described to
+        Tree-sitter as a single edit spanning everything between their common
+        prefix and suffix, so unchanged subtrees are reused by the parser.
+        """
+        parser = self.parsers[language]
+        cached = self._tree_cache.pop(file_path, None)
+        tree = None
+        
+        if cached is not None and cached[0] == language:
+            _, old_bytes, old_tree = cached
+            if old_bytes == content_bytes:
+                tree = old_tree
+            else:
+                prefix = _common_prefix_length(old_bytes, content_bytes)
+                suffix = _common_suffix_length(
+                    old_bytes, content_bytes,
+                    min(len(old_bytes), len(content_bytes)) - prefix
+                )
+                old_end = len(old_bytes) - suffix
+                new_end = len(content_bytes) - suffix
+                
+                if new_end - prefix <= len(content_bytes) * _MAX_INCREMENTAL_CHANGE_RATIO:
+                    old_tree.edit(
+                        start_byte=prefix,
+                        old_end_byte=old_end,
+                        new_end_byte=new_end,
+                        start_point=_point_at(content_bytes, prefix),
+                        old_end_point=_point_at(old_bytes, old_end),
+                        new_end_point=_point_at(content_bytes, new_end),
+                    )
+                    tree = parser.parse(content_bytes, old_tree)
+        
+        if tree is None:
+            tree = parser.parse(content_bytes)
         
-        # Try query-based extraction first (more accurate)
-        try:
-            query_nodes = self._extract_nodes_with_query(tree, content, language, file_path)
-            if query_nodes:
-                nodes.extend(query_nodes)
-                logger.debug(f"Extracted {len(query_nodes)} nodes using queries for {language.value}")
-        except Exception as e:
-            logger.warning(f"Query-based extraction failed for {language.value}: {e}")
+        if self.tree_cache_size > 0:
+            self._tree_cache[file_path] = (language, content_bytes, tree)
+            if len(self._tree_cache) > self.tree_cache_size:
+                self._tree_cache.popitem(last=False)
         
-        # Fallback to tree walking if queries fail or return no results
-        if not nodes:
-            nodes = self._extract_nodes_by_walking(tree, content, language, file_path)
-            logger.debug(f"Extracted {len(nodes)} nodes using tree walking for {language.value}")
+        return tree
+    
+    def extract_nodes(self, tree: tree_sitter.Tree, content: bytes, 
+                     file_path: str, language: Language) -> List[UniversalNode]:
+        """Extract nodes from Tree-sitter tree by walking it."""
+        nodes = self._extract_nodes_by_walking(tree, content, language, file_path)
+        logger.debug(f"Extracted {len(nodes)} nodes using tree walking for {language.value}")
         
         # Build hierarchy
         self._build_node_hierarchy(nodes)
         
         return nodes
     
-    def _extract_nodes_with_query(self, tree: tree_sitter.Tree, content: bytes,
-                                 language: Language, file_path: str) -> List[UniversalNode]:
-        """Extract nodes using Tree-sitter queries."""
-        nodes = []
-        
-        # Get language-specific query
-        query = self._get_symbol_query(language)
-        if not query:
-            return nodes
-        
-        # Create query cursor and execute query
-        cursor = tree_sitter.QueryCursor()
-        captures = cursor.captures(query, tree.root_node)
-        
-        # Process captures
-        for capture in captures:
-            node, capture_name = capture
-            universal_node = self._create_universal_node_from_capture(
-                node, capture_name, content, language, file_path
-            )
-            if universal_node:
-                nodes.append(universal_node)
-        
-        return nodes
-    
     def _extract_nodes_by_walking(self, tree: tree_sitter.Tree, content: bytes,
                                  language: Language, file_path: str) -> List[UniversalNode]:
-        """Extract nodes by walking the Tree-sitter AST."""
-        nodes = []
-        
-        # Get symbol types for this language
+        """Extract nodes by walking the Tree-sitter AST.
+        
+        A single cursor pass visits every node once. While inside a symbol's
+        subtree it collects the symbol's name, modifiers, visibility, parameter
+        list, decision children and nesting level, so no auxiliary walk is needed
+        when the UniversalNode is built on leaving the subtree.
+        """
+        # Node kinds are classified on first sight, then looked up by integer kind id
         symbol_types = self._get_symbol_types(language)
+        modifier_types = _MODIFIER_NODE_TYPES.get(language, frozenset())
+        kinds = self._get_node_kinds(language)
+        
+        scans: List[_SymbolScan] = []
+        open_scans: List[_SymbolScan] = []
+        # nesting_levels[d] counts control-flow ancestors of the node at depth d
+        nesting_levels = [0]
         
-        # Walk the tree and extract symbols
-        def walk_tree(node: tree_sitter.Node, depth: int = 0):
+        for node, depth in _walk_subtree(tree.root_node):
+            while open_scans and open_scans[-1].depth >= depth:
+                self._finish_symbol_scan(open_scans.pop(), content, language, file_path)
+            
+            kind_id = node.kind_id
+            kind = kinds.get(kind_id)
+            if kind is None:
+                kind = kinds[kind_id] = _classify_node_type(node.type, symbol_types, modifier_types)
+            element_type, is_name, is_param_list, is_decision, is_nesting, is_modifier = kind
+            
+            del nesting_levels[depth + 1:]
+            nesting_level = nesting_levels[depth]
+            nesting_levels.append(nesting_level + is_nesting)
+            
             # Check if this node represents a symbol we care about
-            element_type = symbol_types.get(node.type)
             if element_type:
-                universal_node = self._create_universal_node_from_type(
-                    node, element_type, content, language, file_path
-                )
-                if universal_node:
-                    nodes.append(universal_node)
+                scan = _SymbolScan(node, element_type, depth, nesting_level)
+                scans.append(scan)
+                open_scans.append(scan)
             
-            # Recursively walk children
-            for child in node.children:
-                walk_tree(child, depth + 1)
+            if open_scans:
+                self._observe_symbol_node(
+                    open_scans, node, is_name, is_param_list, is_decision, is_modifier, depth
+                )
         
-        # Start walking from root
-        walk_tree(tree.root_node)
+        while open_scans:
+            self._finish_symbol_scan(open_scans.pop(), content, language, file_path)
         
-        return nodes
+        return [scan.node for scan in scans if scan.node is not None]
     
-    def _get_symbol_types(self, language: Language) -> Dict[str, ElementType]:
-        """Get mapping of Tree-sitter node types to ElementTypes for a language."""
-        type_mappings = {
-            Language.PYTHON: {
-                "class_definition": ElementType.CLASS,
-                "function_definition": ElementType.FUNCTION,
-                "assignment": ElementType.VARIABLE,
-                "import_statement": ElementType.IMPORT,
-                "import_from_statement": ElementType.IMPORT,
-            },
-            Language.JAVASCRIPT: {
-                "class_declaration": ElementType.CLASS,
-                "function_declaration": ElementType.FUNCTION,
-                "method_definition": ElementType.METHOD,
-                "variable_declarator": ElementType.VARIABLE,
-                "import_statement": ElementType.IMPORT,
-                "export_statement": ElementType.EXPORT,
-            },
-            Language.TYPESCRIPT: {
-                "class_declaration": ElementType.CLASS,
-                "interface_declaration": ElementType.INTERFACE,
-                "function_declaration": ElementType.FUNCTION,
-                "method_definition": ElementType.METHOD,
-                "variable_declarator": ElementType.VARIABLE,
-                "type_alias_declaration": ElementType.CLASS,
-                "import_statement": ElementType.IMPORT,
-                "export_statement": ElementType.EXPORT,
-            },
-            Language.GO: {
-                "type_declaration": ElementType.CLASS,
-                "function_declaration": ElementType.FUNCTION,
-                "method_declaration": ElementType.METHOD,
-                "var_declaration": ElementType.VARIABLE,
-                "const_declaration": ElementType.CONSTANT,
-                "import_declaration": ElementType.IMPORT,
-            },
-            Language.RUST: {
-                "struct_item": ElementType.STRUCT,
-                "enum_item": ElementType.ENUM,
-                "trait_item": ElementType.TRAIT,
-                "function_item": ElementType.FUNCTION,
-                "impl_item": ElementType.CLASS,
-                "use_declaration": ElementType.IMPORT,
-            },
-        }
-        
-        return type_mappings.get(language, {})
+    @staticmethod
+    def _observe_symbol_node(open_scans: List[_SymbolScan], node: tree_sitter.Node,
+                             is_name: bool, is_param_list: bool, is_decision: bool,
+                             is_modifier: bool, depth: int) -> None:
+        """Record a node visited inside the subtrees of the open symbols."""
+        name = None
+        
+        for scan in open_scans:
+            if is_name and scan.name is None:
+                if name is None:
+                    name = node.text.decode('utf-8', errors='ignore')
+                scan.name = name
+            if is_param_list and scan.param_list is None:
+                scan.param_list = node
+            if depth == scan.depth + 1:
+                if is_decision:
+                    scan.decision_children += 1
+                # Modifiers are always direct children of the declaration
+                if is_modifier:
+                    visibility = _read_modifier_node(node, scan.modifiers)
+                    if scan.visibility is None:
+                        scan.visibility = visibility
     
-    def _create_universal_node_from_type(self, node: tree_sitter.Node, element_type: ElementType,
-                                        content: bytes, language: Language, file_path: str) -> Optional[UniversalNode]:
-        """Create UniversalNode from Tree-sitter node with known element type."""
-        # Extract name
-        name = self._extract_node_name(node, content)
-        if not name and element_type not in [ElementType.IMPORT, ElementType.EXPORT]:
-            return None
-        
-        # Create location
-        location = SourceLocation.from_tree_sitter_node(node, file_path)
-        
-        # Generate unique ID
-        node_id = self._generate_node_id(file_path, name or node.type, location)
-        
-        # Create universal node
-        universal_node = UniversalNode(
-            id=node_id,
-            type=element_type,
-            name=name,
-            language=language,
-            location=location,
-            tree_sitter_type=node.type,
-            lines_of_code=location.end_line - location.start_line + 1,
-            raw_node=node
+    def _finish_symbol_scan(self, scan: _SymbolScan, content: bytes,
+                            language: Language, file_path: str) -> None:
+        """Turn a completed scan into its UniversalNode (or None when unnamed)."""
+        universal_node = self._new_universal_node(
+            scan.node, scan.element_type, scan.name, language, file_path
         )
-        
-        # Extract additional properties
-        self._extract_node_properties(universal_node, node, content, language)
-        
-        return universal_node
+        if universal_node:
+            self._set_node_properties(
+                universal_node, scan.node.type, scan.modifiers, scan.visibility,
+                scan.decision_children, scan.nesting_level, scan.param_list, content
+            )
+        scan.node = universal_node
     
-    def _get_symbol_query(self, language: Language) -> Optional[tree_sitter.Query]:
-        """Get Tree-sitter query for extracting symbols."""
-        queries = {
-            Language.PYTHON: """
-                (class_definition name: (identifier) @class)
-                (function_definition name: (identifier) @function)
-                (assignment left: (identifier) @variable)
-                (import_statement) @import
-                (import_from_statement) @import
-            """,
-            Language.JAVASCRIPT: """
-                (class_declaration name: (identifier) @class)
-                (function_declaration name: (identifier) @function)
-                (method_definition name: (property_identifier) @method)
-                (variable_declarator name: (identifier) @variable)
-                (import_statement) @import
-                (export_statement) @export
-            """,
-            Language.TYPESCRIPT: """
-                (class_declaration name: (type_identifier) @class)
-                (interface_declaration name: (type_identifier) @interface)
-                (function_declaration name: (identifier) @function)
-                (method_definition name: (property_identifier) @method)
-                (variable_declarator name: (identifier) @variable)
-                (type_alias_declaration name: (type_identifier) @type)
-                (import_statement) @import
-                (export_statement) @export
-            """,
-            Language.GO: """
-                (type_declaration (type_spec name: (type_identifier) @type))
-                (function_declaration name: (identifier) @function)
-                (method_declaration name: (field_identifier) @method)
-                (var_declaration (var_spec name: (identifier) @variable))
-                (const_declaration (const_spec name: (identifier) @constant))
-                (import_declaration) @import
-            """,
-            Language.RUST: """
-                (struct_item name: (type_identifier) @struct)
-                (enum_item name: (type_identifier) @enum)
-                (trait_item name: (type_identifier) @trait)
-                (function_item name: (identifier) @function)
-                (impl_item) @impl
-                (use_declaration) @import
-            """,
-        }
-        
-        query_text = queries.get(language)
-        if not query_text:
-            return None
-        
-        cache_key = f"{language.value}_symbols"
-        if cache_key not in self.query_cache:
-            try:
-                ts_language = language.tree_sitter_parser
-                if ts_language:
-                    # Use the new Query constructor as recommended by the documentation
-                    self.query_cache[cache_key] = tree_sitter.Query(ts_language, query_text)
-            except Exception as e:
-                logger.error(f"Failed to create query for {language.value}: {e}")
-                return None
-        
-        return self.query_cache.get(cache_key)
+    def _get_symbol_types(self, language: Language) -> Dict[str, ElementType]:
+        """Get mapping of Tree-sitter node types to ElementTypes for a language."""
+        return _SYMBOL_TYPES.get(language, {})
     
-    def _create_universal_node_from_capture(self, node: tree_sitter.Node, capture_name: str,
-                                           content: bytes, language: Language, file_path: str) -> Optional[UniversalNode]:
-        """Create UniversalNode from Tree-sitter capture."""
-        # Map capture names to element types
-        element_type_map = {
-            "class": ElementType.CLASS,
-            "interface": ElementType.INTERFACE,
-            "function": ElementType.FUNCTION,
-            "method": ElementType.METHOD,
-            "variable": ElementType.VARIABLE,
-            "constant": ElementType.CONSTANT,
-            "struct": ElementType.STRUCT,
-            "enum": ElementType.ENUM,
-            "trait": ElementType.TRAIT,
-            "type": ElementType.CLASS,  # Generic type mapping
-            "import": ElementType.IMPORT,
-            "export": ElementType.EXPORT,
-            "impl": ElementType.CLASS,  # Rust impl blocks
-        }
-        
-        element_type = element_type_map.get(capture_name)
-        if not element_type:
-            return None
-        
-        # Extract name
-        name = self._extract_node_name(node, content)
+    def _get_node_kinds(self, language: Language) -> Dict[int, _NodeKind]:
+        """Per-language table of node kind ids classified so far (see _classify_node_type)."""
+        kinds = self._node_kinds.get(language)
+        if kinds is None:
+            kinds = self._node_kinds[language] = {}
+        return kinds
+    
+    def _new_universal_node(self, node: tree_sitter.Node, element_type: ElementType, name: Optional[str],
+                            language: Language, file_path: str) -> Optional[UniversalNode]:
+        """Create the bare UniversalNode for a symbol; unnamed symbols other than imports/exports are skipped."""
         if not name and element_type not in [ElementType.IMPORT, ElementType.EXPORT]:
             return None
         
@@ -346,7 +526,7 @@ class TreeSitterAdapter:
         node_id = self._generate_node_id(file_path, name or node.type, location)
         
         # Create universal node
-        universal_node = UniversalNode(
+        return UniversalNode(
             id=node_id,
             type=element_type,
             name=name,
@@ -354,40 +534,21 @@ class TreeSitterAdapter:
             location=location,
             tree_sitter_type=node.type,
             lines_of_code=location.end_line - location.start_line + 1,
-            raw_node=node
+            raw_node=node if self.keep_raw_nodes else None
         )
-        
-        # Extract additional properties
-        self._extract_node_properties(universal_node, node, content, language)
-        
-        return universal_node
     
     def _extract_node_name(self, node: tree_sitter.Node, content: bytes) -> Optional[str]:
-        """Extract name from Tree-sitter node."""
-        # Look for identifier nodes
-        name_types = ["identifier", "type_identifier", "property_identifier", "field_identifier"]
-        
-        def find_name(n: tree_sitter.Node) -> Optional[str]:
-            if n.type in name_types:
-                return content[n.start_byte:n.end_byte].decode('utf-8', errors='ignore')
-            
-            for child in n.children:
-                if child.type in name_types:
-                    return content[child.start_byte:child.end_byte].decode('utf-8', errors='ignore')
-                # Recursive search for nested names
-                nested_name = find_name(child)
-                if nested_name:
-                    return nested_name
-            return None
-        
-        return find_name(node)
+        """Extract name from Tree-sitter node (first identifier in pre-order)."""
+        for n, _ in _walk_subtree(node):
+            if n.type in _NAME_NODE_TYPES:
+                return n.text.decode('utf-8', errors='ignore')
+        return None
     
-    def _extract_node_properties(self, universal_node: UniversalNode, 
-                                 node: tree_sitter.Node, content: bytes, language: Language):
-        """Extract language-specific properties from Tree-sitter node."""
-        # Extract modifiers
-        modifiers = self._find_modifiers(node, content)
-        
+    def _set_node_properties(self, universal_node: UniversalNode, node_type: str,
+                             modifiers: Set[str], visibility: Optional[str],
+                             decision_children: int, nesting_level: int,
+                             param_list: Optional[tree_sitter.Node], content: bytes) -> None:
+        """Apply modifiers, visibility, complexity and parameters to a node."""
         if "static" in modifiers:
             universal_node.is_static = True
         if "async" in modifiers:
@@ -400,7 +561,6 @@ class TreeSitterAdapter:
             universal_node.is_const = True
         
         # Extract visibility
-        visibility = self._extract_visibility(node, content)
         if visibility:
             from ..models.universal import AccessLevel
             try:
@@ -409,72 +569,21 @@ class TreeSitterAdapter:
                 pass  # Unknown visibility level
         
         # Calculate complexity
-        universal_node.complexity = self._calculate_node_complexity(node)
-        universal_node.cognitive_complexity = self._calculate_cognitive_complexity(node)
+        universal_node.complexity = ComplexityCalculator.calculate_cyclomatic_from_counts(
+            node_type, decision_children
+        )
+        universal_node.cognitive_complexity = self._cognitive_complexity_from_types(
+            node_type, nesting_level
+        )
         
         # Extract parameters for functions/methods
-        if universal_node.type in [ElementType.FUNCTION, ElementType.METHOD]:
-            universal_node.parameters = self._extract_parameters(node, content, language)
-    
-    def _find_modifiers(self, node: tree_sitter.Node, content: bytes) -> Set[str]:
-        """Find modifier keywords in node."""
-        modifiers = set()
-        modifier_keywords = {
-            "static", "async", "abstract", "final", "sealed", 
-            "const", "readonly", "public", "private", "protected"
-        }
-        
-        def search_modifiers(n: tree_sitter.Node):
-            node_text = content[n.start_byte:n.end_byte].decode('utf-8', errors='ignore')
-            if node_text.lower() in modifier_keywords:
-                modifiers.add(node_text.lower())
-            
-            for child in n.children:
-                search_modifiers(child)
-        
-        search_modifiers(node)
-        return modifiers
-    
-    def _extract_visibility(self, node: tree_sitter.Node, content: bytes) -> Optional[str]:
-        """Extract visibility/access level from node."""
-        visibility_keywords = ["public", "private", "protected", "internal", "package"]
-        
-        def find_visibility(n: tree_sitter.Node) -> Optional[str]:
-            node_text = content[n.start_byte:n.end_byte].decode('utf-8', errors='ignore')
-            if node_text.lower() in visibility_keywords:
-                return node_text.lower()
-            
-            for child in n.children:
-                vis = find_visibility(child)
-                if vis:
-                    return vis
-            return None
-        
-        return find_visibility(node)
+        if universal_node.type in [ElementType.FUNCTION, ElementType.METHOD] and param_list:
+            universal_node.parameters = self._extract_parameters_from_list(param_list, content)
     
-    def _extract_parameters(self, node: tree_sitter.Node, content: bytes, 
-                           language: Language) -> List[Dict[str, Any]]:
-        """Extract function parameters."""
+    def _extract_parameters_from_list(self, param_list: tree_sitter.Node,
+                                      content: bytes) -> List[Dict[str, Any]]:
+        """Extract individual parameters from a parameter list node."""
         params = []
-        
-        # Find parameter list
-        param_list_types = ["parameters", "parameter_list", "formal_parameters"]
-        param_list = None
-        
-        def find_param_list(n: tree_sitter.Node):
-            if n.type in param_list_types:
-                return n
-            for child in n.children:
-                result = find_param_list(child)
-                if result:
-                    return result
-            return None
-        
-        param_list = find_param_list(node)
-        if not param_list:
-            return params
-        
-        # Extract individual parameters
         position = 0
         for child in param_list.children:
             if "parameter" in child.type or child.type in ["identifier", "typed_parameter"]:
@@ -498,156 +607,116 @@ class TreeSitterAdapter:
         return params
     
     def _extract_type_from_node(self, node: tree_sitter.Node, content: bytes) -> Optional[str]:
-        """Extract type information from node."""
-        type_node_types = ["type", "type_annotation", "type_identifier", "primitive_type"]
-        
-        def find_type(n: tree_sitter.Node) -> Optional[str]:
-            if n.type in type_node_types:
+        """Extract type information from node (the node itself or a direct child)."""
+        for n in (node, *node.children):
+            if n.type in _TYPE_NODE_TYPES:
                 return content[n.start_byte:n.end_byte].decode('utf-8', errors='ignore')
-            
-            for child in n.children:
-                if child.type in type_node_types:
-                    return content[child.start_byte:child.end_byte].decode('utf-8', errors='ignore')
-            return None
-        
-        return find_type(node)
-    
-    def _calculate_node_complexity(self, node: tree_sitter.Node) -> float:
-        """Calculate cyclomatic complexity using centralized calculator."""
-        # Convert tree-sitter node to data format expected by ComplexityCalculator
-        node_data = {
-            'type': node.type,
-            'children': self._convert_tree_sitter_children(node)
-        }
-        return ComplexityCalculator.calculate_cyclomatic_complexity(node_data)
-    
-    def _convert_tree_sitter_children(self, node: tree_sitter.Node) -> list:
-        """Convert tree-sitter node children to data format."""
-        children = []
-        for child in node.children:
-            children.append({'type': child.type})
-        return children
+        return None
     
-    def _calculate_cognitive_complexity(self, node: tree_sitter.Node) -> int:
-        """Calculate cognitive complexity using centralized calculator."""
-        # Convert tree-sitter node to data format expected by ComplexityCalculator
-        nesting_level = self._calculate_nesting_level(node)
+    def _cognitive_complexity_from_types(self, node_type: str, nesting_level: int) -> int:
+        """Cognitive complexity from a node's type and nesting level."""
         node_data = {
-            'type': node.type,
+            'type': node_type,
             'nesting_level': nesting_level,
-            'children': self._convert_tree_sitter_children(node)
         }
         return int(ComplexityCalculator.calculate_cognitive_complexity(node_data))
     
-    def _calculate_nesting_level(self, node: tree_sitter.Node) -> int:
-        """Calculate nesting level for a node."""
-        level = 0
-        parent = node.parent
-        while parent:
-            if parent.type in ["if_statement", "while_statement", "for_statement", "function_definition", "method_definition"]:
-                level += 1
-            parent = parent.parent
-        return level
-    
     def _build_node_hierarchy(self, nodes: List[UniversalNode]):
-        """Build parent-child relationships between nodes."""
-        # Sort by byte position for efficient hierarchy building
-        nodes_by_position = sorted(nodes, key=lambda n: (n.location.start_byte or 0, n.location.end_byte or 0))
-        
-        for i, node in enumerate(nodes_by_position):
-            # Find the most immediate parent
-            for j in range(i - 1, -1, -1):
-                potential_parent = nodes_by_position[j]
-                
-                # Check if node is contained within potential_parent
-                if (potential_parent.location.start_byte is not None and 
-                    node.location.start_byte is not None and
-                    potential_parent.location.start_byte <= node.location.start_byte and
-                    potential_parent.location.end_byte >= node.location.end_byte and
-                    potential_parent != node):
-                    
-                    # This is the immediate parent
-                    node.parent_id = potential_parent.id
-                    if node.id not in potential_parent.children_ids:
-                        potential_parent.children_ids.append(node.id)
-                    break
-    
-    def _extract_imports(self, tree: tree_sitter.Tree, content: bytes, language: Language) -> List[str]:
-        """Extract import statements."""
-        imports = []
-        
-        import_queries = {
-            Language.PYTHON: "(import_statement) @import (import_from_statement) @import",
-            Language.JAVASCRIPT: "(import_statement) @import",
-            Language.TYPESCRIPT: "(import_statement) @import",
-            Language.GO: "(import_declaration) @import",
-            Language.RUST: "(use_declaration) @import",
-        }
-        
-        query_text = import_queries.get(language)
-        if not query_text:
-            return imports
-        
-        try:
-            parser_lib = language.tree_sitter_parser
-            if parser_lib:
-                query = parser_lib.query(query_text)
-                captures = query.captures(tree.root_node)
-                
-                for node, _ in captures:
-                    import_text = content[node.start_byte:node.end_byte].decode('utf-8', errors='ignore')
-                    # Extract just the module name (simplified)
-                    import_name = self._parse_import_statement(import_text, language)
-                    if import_name:
-                        imports.append(import_name)
-        except Exception as e:
-            logger.warning(f"Failed to extract imports for {language.value}: {e}")
+        """Build parent-child relationships between nodes.
+        
+        Symbol ranges are either nested or disjoint, so after sorting by start
+        (enclosing nodes first) a stack of open ancestors yields each node's
+        immediate parent in a single pass.
+        """
+        nodes_by_position = sorted(
+            nodes, key=lambda n: (n.location.start_byte or 0, -(n.location.end_byte or 0))
+        )
         
-        return imports
+        ancestors: List[UniversalNode] = []
+        for node in nodes_by_position:
+            end_byte = node.location.end_byte or 0
+            while ancestors and (ancestors[-1].location.end_byte or 0) < end_byte:
+                ancestors.pop()
+            
+            if ancestors:
+                parent = ancestors[-1]
+                node.parent_id = parent.id
+                parent.children_ids.append(node.id)
+            ancestors.append(node)
     
-    def _extract_exports(self, tree: tree_sitter.Tree, content: bytes, language: Language) -> List[str]:
-        """Extract export statements."""
+    def _collect_imports_exports(self, nodes: List[UniversalNode], tree: tree_sitter.Tree,
+                                 content: bytes, language: Language) -> Tuple[List[str], List[str]]:
+        """Collect import and export names from the extracted IMPORT/EXPORT nodes.
+        
+        Import and export statements are already found by the tree walk, so
+        they are located again by byte range instead of running separate
+        queries over the tree.
+        """
+        imports = []
         exports = []
-        
-        # Only JavaScript/TypeScript typically have explicit exports
-        if language not in [Language.JAVASCRIPT, Language.TYPESCRIPT]:
-            return exports
-        
-        try:
-            parser_lib = language.tree_sitter_parser
-            if parser_lib:
-                query = parser_lib.query("(export_statement) @export")
-                captures = query.captures(tree.root_node)
-                
-                for node, _ in captures:
-                    export_text = content[node.start_byte:node.end_byte].decode('utf-8', errors='ignore')
-                    export_name = self._parse_export_statement(export_text)
-                    if export_name:
-                        exports.append(export_name)
-        except Exception as e:
-            logger.warning(f"Failed to extract exports for {language.value}: {e}")
-        
-        return exports
+        root = tree.root_node
+        
+        for node in nodes:
+            location = node.location
+            if node.type == ElementType.IMPORT:
+                import_node = root.descendant_for_byte_range(location.start_byte, location.end_byte)
+                if import_node is not None:
+                    imports.extend(self._parse_import_statement(import_node, language))
+            elif node.type == ElementType.EXPORT:
+                # Only JavaScript/TypeScript typically have explicit exports
+                export_text = content[location.start_byte:location.end_byte].decode('utf-8', errors='ignore')
+                export_name = self._parse_export_statement(export_text)
+                if export_name:
+                    exports.append(export_name)
+        
+        return imports, exports
     
-    def _parse_import_statement(self, import_text: str, language: Language) -> Optional[str]:
-        """Parse import statement to extract module name."""
-        # Simplified parsing - would need more sophisticated logic
+    def _parse_import_statement(self, import_node: tree_sitter.Node, language: Language) -> List[str]:
+        """Extract the imported module names from an import statement's syntax tree."""
+        module_nodes = []
+        
         if language == Language.PYTHON:
-            if import_text.startswith("import "):
-                return import_text.replace("import ", "").strip().split()[0]
-            elif "from " in import_text:
-                parts = import_text.split()
-                if len(parts) >= 2:
-                    return parts[1]
+            if import_node.type == "import_from_statement":
+                module_nodes.append(import_node.child_by_field_name("module_name"))
+            else:
+                # import a.b as c, d
+                for name in import_node.children_by_field_name("name"):
+                    if name.type == "aliased_import":
+                        name = name.child_by_field_name("name")
+                    module_nodes.append(name)
         elif language in [Language.JAVASCRIPT, Language.TYPESCRIPT]:
-            if "from " in import_text:
-                # Extract string after 'from'
-                parts = import_text.split("from ")
-                if len(parts) > 1:
-                    module = parts[1].strip().strip("';\"")
-                    return module
-        
-        return None
+            source = import_node.child_by_field_name("source")
+            if source is None:
+                # TypeScript: import fs = require("fs")
+                for child in import_node.named_children:
+                    if child.type == "import_require_clause":
+                        source = child.child_by_field_name("source")
+            module_nodes.append(source)
+        elif language == Language.GO:
+            specs = [child for child in import_node.named_children if child.type == "import_spec"]
+            for spec_list in import_node.named_children:
+                if spec_list.type == "import_spec_list":
+                    specs.extend(child for child in spec_list.named_children if child.type == "import_spec")
+            module_nodes.extend(spec.child_by_field_name("path") for spec in specs)
+        elif language == Language.RUST:
+            argument = import_node.child_by_field_name("argument")
+            # use a::b as c; use a::{b, c}; use a::*
+            if argument is not None and argument.type in ("use_as_clause", "scoped_use_list"):
+                argument = argument.child_by_field_name("path")
+            elif argument is not None and argument.type == "use_wildcard":
+                argument = argument.named_children[0] if argument.named_children else None
+            module_nodes.append(argument)
+        
+        modules = []
+        for module_node in module_nodes:
+            if module_node is None:
+                continue
+            module = module_node.text.decode('utf-8', errors='ignore')
+            if module_node.type in _STRING_LITERAL_NODE_TYPES:
+                module = module[1:-1]
+            if module:
+                modules.append(module)
+        return modules
     
     def _parse_export_statement(self, export_text: str) -> Optional[str]:
         """Parse export statement to extract exported name."""
@@ -656,19 +725,17 @@ class TreeSitterAdapter:
             return "exported_item"  # Placeholder
         return None
     
-    def _count_code_lines(self, content: str) -> int:
-        """Count non-empty, non-comment lines."""
-        code_lines = 0
-        for line in content.splitlines():
-            stripped = line.strip()
-            if stripped and not self._is_comment_line(stripped):
-                code_lines += 1
-        return code_lines
-    
-    def _is_comment_line(self, line: str) -> bool:
-        """Check if line is a comment."""
-        comment_markers = ['#', '//', '/*', '*', '<!--', '--', '///', '##']
-        return any(line.startswith(marker) for marker in comment_markers)
+    def _count_lines(self, content: bytes) -> Tuple[int, int]:
+        """Count total lines (as str.splitlines() would) and non-empty, non-comment lines.
+        
+        Both counts come from one translated copy of the UTF-8 source, in which
+        CRLF pairs appear as two line breaks.
+        """
+        normalized = content.translate(_LINE_BREAK_TRANSLATION)
+        total_lines = normalized.count(b'\n') - content.count(b'\r\n')
+        if normalized and not normalized.endswith(b'\n'):
+            total_lines += 1
+        return total_lines, len(_CODE_LINE_RE.findall(normalized))
     
     def _calculate_file_complexity(self, nodes: List[UniversalNode]) -> float:
         """Calculate average complexity for file."""
@@ -684,7 +751,6 @@ class TreeSitterAdapter:
     
     def _generate_node_id(self, file_path: str, name: str, location: SourceLocation) -> str:
         """Generate unique node ID using centralized utility."""
-        from ..common.identifiers import IDGenerator
         return IDGenerator.generate_node_id(
             file_path, name, location.start_line, 
             location.start_column, location.start_byte or 0
@@ -1,11 +1,32 @@
 """Code analyzers for universal AST processing."""
 
-from .universal import UniversalAnalyzer
-from .integrated import IntegratedCodeAnalyzer
-from .intelligence import IntelligenceEngine
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .universal import UniversalAnalyzer
+    from .integrated import IntegratedCodeAnalyzer
+    from .intelligence import IntelligenceEngine
 
 __all__ = [
     "UniversalAnalyzer",
     "IntegratedCodeAnalyzer",
     "IntelligenceEngine",
 ]
+
+# Loaded on first access (PEP 562) so importing one analyzer module does not
+# drag in the others (IntegratedCodeAnalyzer pulls in the visualization stack).
+_LAZY_IMPORTS = {
+    "UniversalAnalyzer": ".universal",
+    "IntegratedCodeAnalyzer": ".integrated",
+    "IntelligenceEngine": ".intelligence",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
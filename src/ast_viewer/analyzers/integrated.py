@@ -1,26 +1,115 @@
 """Integrated code analyzer combining universal analysis with project-level insights."""
 
+import copy
+import functools
+import hashlib
+import json
 import logging
+import os
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union, Any
+
+from pydantic import TypeAdapter
 
 from .universal import UniversalAnalyzer
 from .intelligence import IntelligenceEngine
-from ..models.universal import ElementType, UniversalFile, CodeIntelligence
+from ..common.identifiers import IDGenerator
+from ..models.universal import (
+    ElementType, Language, UniversalFile, CodeIntelligence, Reference, Relationship, RelationType
+)
 from ..visualizations.engine import VisualizationEngine, VisualizationType
 
 logger = logging.getLogger(__name__)
 
+# Serialize whole result lists in one call instead of one model_dump per item
+_REFERENCE_LIST_ADAPTER = TypeAdapter(List[Reference])
+_RELATIONSHIP_LIST_ADAPTER = TypeAdapter(List[Relationship])
+
+_RELATION_TYPES_BY_VALUE = {relation_type.value: relation_type for relation_type in RelationType}
+
+# Enum -> string tables; a dict lookup is cheaper than the .name/.value descriptors
+_RELATION_TYPE_VALUES = {relation_type: relation_type.value for relation_type in RelationType}
+_ELEMENT_TYPE_NAMES = {element_type: element_type.name for element_type in ElementType}
+_LANGUAGE_VALUES = {language: language.value for language in Language}
+_PROJECT_TYPE_NAME = ElementType.PROJECT.name
+_PACKAGE_TYPE_NAME = ElementType.PACKAGE.name
+_FILE_TYPE_NAME = ElementType.FILE.name
+
+# File path -> ((mtime_ns, size), content hash) for one project's files
+_ContentHashes = Dict[str, Tuple[Tuple[int, int], str]]
+
+
+@functools.lru_cache(maxsize=4096)
+def _first_module_part(import_stmt: str) -> str:
+    """Top-level module of a dotted import ("os.path" -> "os")."""
+    return import_stmt.split('.', 1)[0]
+
+
+class _LazyFilesMapping(Mapping):
+    """Read-only ``{path: file dict}`` view that dumps each file on first access.
+    
+    Callers that only need project metrics never pay for serializing every
+    file, and filtered iteration only dumps the files it actually reads.
+    """
+    
+    def __init__(self, file_analyses: Dict[str, UniversalFile]):
+        self._file_analyses = file_analyses
+        self._dumped: Dict[str, Dict[str, Any]] = {}
+    
+    def __getitem__(self, path: str) -> Dict[str, Any]:
+        dumped = self._dumped.get(path)
+        if dumped is None:
+            dumped = self._dumped[path] = self._file_analyses[path].model_dump()
+        return dumped
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._file_analyses)
+    
+    def __len__(self) -> int:
+        return len(self._file_analyses)
+    
+    def write_json(self, stream: BinaryIO) -> None:
+        """Write the mapping as a JSON object, one file at a time.
+        
+        Each file is encoded by Pydantic's JSON serializer straight from the
+        model, so no intermediate dicts are built.
+        """
+        stream.write(b'{')
+        for i, (path, file_analysis) in enumerate(self._file_analyses.items()):
+            if i:
+                stream.write(b',')
+            stream.write(json.dumps(path).encode('utf-8'))
+            stream.write(b':')
+            stream.write(file_analysis.model_dump_json().encode('utf-8'))
+        stream.write(b'}')
+
 
 class IntegratedCodeAnalyzer:
     """High-level analyzer integrating all components."""
     
-    def __init__(self, cache_manager=None):
+    def __init__(self, cache_manager=None, project_cache_size: int = 16):
+        """
+        Initialize analyzer.
+        
+        Args:
+            cache_manager: Optional cache shared with the legacy components
+            project_cache_size: Maximum number of analyze_project results kept
+                                for reuse, least recently used evicted first
+                                (0 disables)
+        """
         self.universal_analyzer = UniversalAnalyzer()
         self.intelligence_engine = IntelligenceEngine()
         self.visualization_engine = VisualizationEngine()
         self.cache = cache_manager
         
+        # project_id -> (project fingerprint, analyze_project result, content hashes);
+        # unchanged files are not re-read, and a project's hashes are evicted
+        # together with its result
+        self.project_cache_size = project_cache_size
+        self._project_results: "OrderedDict[str, Tuple[str, Dict[str, Any], _ContentHashes]]" = OrderedDict()
+        
         # Import existing components if available
         try:
             from repository_analyzer import RepositoryAnalyzer
@@ -36,43 +125,110 @@ class IntegratedCodeAnalyzer:
     
     def analyze_project(self, project_path: Union[str, Path], 
                         project_name: str = None) -> Dict[str, Any]:
-        """Complete project analysis using universal model with code intelligence."""
+        """Complete project analysis using universal model with code intelligence.
+        
+        ``files`` is a read-only mapping whose per-file dicts are built on access;
+        ``files.write_json(stream)`` encodes it without building them at all.
+        
+        Results are memoized per project: when no analyzable file was added,
+        removed or changed since the last call, the previous result is returned
+        without re-running the analysis.
+        """
         project_path = Path(project_path)
         project_name = project_name or project_path.name
         project_id = f"project:{project_name}"
         
+        file_paths = self.universal_analyzer.discover_files(project_path)
+        previous = self._project_results.get(project_id)
+        fingerprint, content_hashes = self._project_fingerprint(
+            project_path, file_paths, previous[2] if previous is not None else {}
+        )
+        if previous is not None and previous[0] == fingerprint:
+            logger.info(f"Reusing analysis of unchanged project {project_name}")
+            self._project_results.move_to_end(project_id)
+            return self._copy_result(previous[1])
+        
         logger.info(f"Starting comprehensive analysis of {project_name}")
         
         # Analyze all files
-        file_analyses = self.universal_analyzer.analyze_directory(project_path)
+        file_analyses = self.universal_analyzer.analyze_files(file_paths)
         
         # Perform intelligence analysis
         intelligence = self.intelligence_engine.analyze_project_intelligence(project_id, file_analyses)
         
+        # Discovered Path objects are shared by the passes below
+        paths = {str(file_path): file_path for file_path in file_paths}
+        
         # Build project structure
-        project_data = self._build_project_structure(project_path, project_name, file_analyses)
+        project_data = self._build_project_structure(project_path, project_name, file_analyses, paths)
         
         # Calculate project metrics (enhanced with intelligence)
         metrics = self._calculate_enhanced_metrics(file_analyses, intelligence)
         
         # Build dependency graph
-        dependencies = self._analyze_dependencies(file_analyses)
+        dependencies = self._analyze_dependencies(file_analyses, paths)
         
-        return {
+        dependency_graph = intelligence.dependency_graph.model_dump() if intelligence.dependency_graph else None
+        
+        result = {
             'project': project_data,
-            'files': {path: file.model_dump() for path, file in file_analyses.items()},
+            'files': _LazyFilesMapping(file_analyses),
             'metrics': metrics,
             'dependencies': dependencies,
             'languages': self._get_language_distribution(file_analyses),
+            # The totals and graph metrics were already gathered for the metrics
             'intelligence': {
-                'total_symbols': len(intelligence.symbols),
-                'total_relationships': len(intelligence.relationships),
-                'total_references': sum(len(refs) for refs in intelligence.references.values()),
+                'total_symbols': metrics['total_symbols'],
+                'total_relationships': metrics['total_relationships'],
+                'total_references': metrics['total_references'],
                 'call_graph_nodes': len(intelligence.call_graph),
-                'graph_metrics': intelligence.metrics.get('graph_metrics', {}),
-                'dependency_graph': intelligence.dependency_graph.model_dump() if intelligence.dependency_graph else None
+                'graph_metrics': metrics['graph_metrics'],
+                'dependency_graph': dependency_graph
             }
         }
+        if self.project_cache_size > 0:
+            self._project_results[project_id] = (fingerprint, result, content_hashes)
+            self._project_results.move_to_end(project_id)
+            if len(self._project_results) > self.project_cache_size:
+                self._project_results.popitem(last=False)
+        return self._copy_result(result)
+    
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a memoized result that the caller can mutate freely.
+        
+        Sections are deep-copied; ``files`` gets a fresh lazy view over the same
+        UniversalFile models, so its per-file dicts are not shared either.
+        """
+        return {
+            key: _LazyFilesMapping(value._file_analyses) if key == 'files' else copy.deepcopy(value)
+            for key, value in result.items()
+        }
+    
+    def _project_fingerprint(self, project_path: Path, file_paths: List[Path],
+                             known_hashes: _ContentHashes) -> Tuple[str, _ContentHashes]:
+        """Hash the project's analyzable files by path and content.
+        
+        A file's content is only re-hashed when its modification time or size
+        differs from ``known_hashes``. Returns the fingerprint and the content
+        hashes of the current files.
+        """
+        content_hashes: _ContentHashes = {}
+        digest = hashlib.sha256(str(project_path).encode('utf-8'))
+        for file_path in sorted(file_paths):
+            path_str = str(file_path)
+            try:
+                stat = file_path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                known = known_hashes.get(path_str)
+                if known is None or known[0] != signature:
+                    known = (signature, IDGenerator.generate_file_hash(file_path.read_bytes()))
+                content_hashes[path_str] = known
+                content_hash = known[1]
+            except OSError:
+                content_hash = ''
+            digest.update(f"{path_str}\0{content_hash}\0".encode('utf-8'))
+        return digest.hexdigest(), content_hashes
     
     def get_intelligence(self, project_id: str) -> Optional[CodeIntelligence]:
         """Get cached intelligence analysis for a project."""
@@ -101,7 +257,7 @@ class IntegratedCodeAnalyzer:
             return []
         
         references = intelligence.get_symbol_references(symbol_id)
-        return [ref.model_dump() for ref in references]
+        return _REFERENCE_LIST_ADAPTER.dump_python(references)
     
     def get_symbol_relationships(self, project_id: str, symbol_id: str, 
                                relationship_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
@@ -110,13 +266,12 @@ class IntegratedCodeAnalyzer:
         if not intelligence:
             return []
         
-        from ..models.universal import RelationType
         rel_types = None
         if relationship_types:
-            rel_types = [RelationType(t) for t in relationship_types if t in RelationType.__members__.values()]
+            rel_types = [_RELATION_TYPES_BY_VALUE[t] for t in relationship_types if t in _RELATION_TYPES_BY_VALUE]
         
         relationships = intelligence.get_symbol_relationships(symbol_id, rel_types)
-        return [rel.model_dump() for rel in relationships]
+        return _RELATIONSHIP_LIST_ADAPTER.dump_python(relationships)
     
     def generate_visualization(self, project_id: str, visualization_type: str, **kwargs) -> Dict[str, Any]:
         """Generate a visualization for the project."""
@@ -147,36 +302,52 @@ class IntegratedCodeAnalyzer:
         return self.visualization_engine.get_available_visualizations()
     
     def _build_project_structure(self, root_path: Path, project_name: str,
-                                 file_analyses: Dict[str, UniversalFile]) -> Dict[str, Any]:
+                                 file_analyses: Dict[str, UniversalFile],
+                                 paths: Optional[Dict[str, Path]] = None) -> Dict[str, Any]:
         """Build hierarchical project structure."""
         structure = {
             'name': project_name,
             'path': str(root_path),
-            'type': ElementType.PROJECT.name,
+            'type': _PROJECT_TYPE_NAME,
             'children': {}
         }
         
-        # Build tree structure
+        # Build tree structure; children dicts are indexed by directory parts so
+        # files in an already seen directory skip the descent from the root
+        dir_children: Dict[Tuple[str, ...], Dict[str, Any]] = {(): structure['children']}
+        # Discovered paths are spelled from root_path, so stripping the prefix
+        # is enough; anything else goes through Path.relative_to
+        root_prefix = os.path.join(str(root_path), '')
         for file_path, file_analysis in file_analyses.items():
-            rel_path = Path(file_path).relative_to(root_path)
-            parts = rel_path.parts
+            if file_path.startswith(root_prefix):
+                parts = tuple(file_path[len(root_prefix):].split(os.sep))
+            else:
+                parts = (paths[file_path] if paths else Path(file_path)).relative_to(root_path).parts
+            dir_parts = parts[:-1]
             
-            current = structure['children']
-            for part in parts[:-1]:
-                if part not in current:
-                    current[part] = {
+            current = dir_children.get(dir_parts)
+            if current is None:
+                # Every seen directory is indexed, so only the levels below the
+                # deepest indexed ancestor need new nodes
+                start = len(dir_parts) - 1
+                while dir_parts[:start] not in dir_children:
+                    start -= 1
+                current = dir_children[dir_parts[:start]]
+                for level in range(start, len(dir_parts)):
+                    part = dir_parts[level]
+                    package = current[part] = {
                         'name': part,
-                        'type': ElementType.PACKAGE.name,
+                        'type': _PACKAGE_TYPE_NAME,
                         'children': {}
                     }
-                current = current[part]['children']
+                    current = dir_children[dir_parts[:level + 1]] = package['children']
             
             # Add file
             file_name = parts[-1]
             current[file_name] = {
                 'name': file_name,
-                'type': ElementType.FILE.name,
-                'language': file_analysis.language.value,
+                'type': _FILE_TYPE_NAME,
+                'language': _LANGUAGE_VALUES[file_analysis.language],
                 'metrics': {
                     'lines': file_analysis.total_lines,
                     'complexity': file_analysis.complexity,
@@ -189,28 +360,38 @@ class IntegratedCodeAnalyzer:
     def _calculate_enhanced_metrics(self, file_analyses: Dict[str, UniversalFile], 
                                   intelligence: CodeIntelligence) -> Dict[str, Any]:
         """Calculate enhanced project metrics including intelligence data."""
-        total_lines = sum(f.total_lines for f in file_analyses.values())
-        total_code_lines = sum(f.code_lines for f in file_analyses.values())
-        total_nodes = sum(len(f.nodes) for f in file_analyses.values())
-        complexities = [f.complexity for f in file_analyses.values() if f.complexity > 0]
+        # One pass over the files
+        total_lines = total_code_lines = total_nodes = total_imports = 0
+        complexity_sum = max_complexity = 0
+        complexity_count = 0
+        for f in file_analyses.values():
+            total_lines += f.total_lines
+            total_code_lines += f.code_lines
+            total_nodes += len(f.nodes)
+            total_imports += len(f.imports)
+            complexity = f.complexity
+            if complexity > 0:
+                complexity_sum += complexity
+                complexity_count += 1
+                if complexity > max_complexity:
+                    max_complexity = complexity
         
-        # Calculate symbol type distribution
+        # One pass over the symbols: type distribution and cognitive complexity
         symbol_types = {}
+        cognitive_sum = max_cognitive = 0
+        cognitive_count = 0
         for symbol in intelligence.symbols.values():
-            symbol_type = symbol.type.name
+            symbol_type = _ELEMENT_TYPE_NAMES[symbol.type]
             symbol_types[symbol_type] = symbol_types.get(symbol_type, 0) + 1
+            cognitive = symbol.cognitive_complexity
+            if cognitive > 0:
+                cognitive_sum += cognitive
+                cognitive_count += 1
+                if cognitive > max_cognitive:
+                    max_cognitive = cognitive
         
         # Calculate relationship type distribution
-        relationship_types = {}
-        for rel in intelligence.relationships:
-            rel_type = rel.type.value
-            relationship_types[rel_type] = relationship_types.get(rel_type, 0) + 1
-        
-        # Calculate cognitive complexity metrics
-        cognitive_complexities = [
-            symbol.cognitive_complexity for symbol in intelligence.symbols.values()
-            if hasattr(symbol, 'cognitive_complexity') and symbol.cognitive_complexity > 0
-        ]
+        relationship_types = dict(Counter(_RELATION_TYPE_VALUES[rel.type] for rel in intelligence.relationships))
         
         return {
             # Basic metrics
@@ -218,9 +399,9 @@ class IntegratedCodeAnalyzer:
             'total_lines': total_lines,
             'total_code_lines': total_code_lines,
             'total_nodes': total_nodes,
-            'average_complexity': sum(complexities) / len(complexities) if complexities else 0,
-            'max_complexity': max(complexities) if complexities else 0,
-            'total_imports': sum(len(f.imports) for f in file_analyses.values()),
+            'average_complexity': complexity_sum / complexity_count if complexity_count else 0,
+            'max_complexity': max_complexity,
+            'total_imports': total_imports,
             
             # Intelligence metrics
             'total_symbols': len(intelligence.symbols),
@@ -230,22 +411,28 @@ class IntegratedCodeAnalyzer:
             'relationship_types': relationship_types,
             
             # Advanced complexity metrics
-            'average_cognitive_complexity': sum(cognitive_complexities) / len(cognitive_complexities) if cognitive_complexities else 0,
-            'max_cognitive_complexity': max(cognitive_complexities) if cognitive_complexities else 0,
+            'average_cognitive_complexity': cognitive_sum / cognitive_count if cognitive_count else 0,
+            'max_cognitive_complexity': max_cognitive,
             
             # Graph metrics (if available)
             'graph_metrics': intelligence.metrics.get('graph_metrics', {})
         }
     
-    def _analyze_dependencies(self, file_analyses: Dict[str, UniversalFile]) -> Dict[str, List[str]]:
+    def _analyze_dependencies(self, file_analyses: Dict[str, UniversalFile],
+                              paths: Optional[Dict[str, Path]] = None) -> Dict[str, List[str]]:
         """Build dependency graph from imports."""
         dependencies = {}
         
+        # Index files by stem once; the first file with a given stem wins
+        stem_index: Dict[str, str] = {}
+        for file_path in file_analyses:
+            stem_index.setdefault((paths[file_path] if paths else Path(file_path)).stem, file_path)
+        
         for file_path, file_analysis in file_analyses.items():
             deps = []
             for import_stmt in file_analysis.imports:
                 # Try to resolve import to local file
-                resolved = self._resolve_import(import_stmt, file_path, file_analyses)
+                resolved = self._resolve_import(import_stmt, file_path, stem_index)
                 if resolved:
                     deps.append(resolved)
             
@@ -254,22 +441,12 @@ class IntegratedCodeAnalyzer:
         
         return dependencies
     
-    def _resolve_import(self, import_stmt: str, from_file: str, 
-                       all_files: Dict[str, UniversalFile]) -> Optional[str]:
+    def _resolve_import(self, import_stmt: str, from_file: str,
+                       stem_index: Dict[str, str]) -> Optional[str]:
         """Resolve import to local file if possible."""
         # Simple resolution - would need enhancement for real use
-        module_name = import_stmt.split('.')[0]
-        
-        for file_path in all_files:
-            if Path(file_path).stem == module_name:
-                return file_path
-        
-        return None
+        return stem_index.get(_first_module_part(import_stmt))
     
     def _get_language_distribution(self, file_analyses: Dict[str, UniversalFile]) -> Dict[str, int]:
         """Get distribution of languages in project."""
-        distribution = {}
-        for file_analysis in file_analyses.values():
-            lang = file_analysis.language.value
-            distribution[lang] = distribution.get(lang, 0) + 1
-        return distribution
+        return dict(Counter(_LANGUAGE_VALUES[file_analysis.language] for file_analysis in file_analyses.values()))
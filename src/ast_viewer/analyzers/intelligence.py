@@ -1,9 +1,14 @@
 """Code Intelligence Engine for relationship analysis and advanced code understanding."""
 
 import logging
-from collections import defaultdict
+import os
+from bisect import bisect_right
+from collections import defaultdict, deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Any
+from typing import Dict, List, Optional, Set, Any, Tuple
 import re
 
 try:
@@ -30,19 +35,72 @@ from ..common.metrics import ComplexityCalculator
 
 logger = logging.getLogger(__name__)
 
+# Identifier tokens for name-based reference search
+_IDENTIFIER_RE = re.compile(r'\w+')
+
+# A scanned source file: its content, the offset where each line starts
+# (plus a final end offset) and, per identifier token, the
+# (line number, start column, end column) of each occurrence
+_ScannedFile = Tuple[str, List[int], Dict[str, List[Tuple[int, int, int]]]]
+
+
+@lru_cache(maxsize=4096)
+def _compile_name(name: str) -> re.Pattern:
+    """Whole-word pattern for a symbol name, compiled once across analyses."""
+    return re.compile(r'\b' + re.escape(name) + r'\b')
+
+
+# Below this many unscanned files a process pool costs more than it saves
+_PARALLEL_SCAN_MIN_FILES = 32
+
+
+@analysis_operation(default_return=None)
+def _scan_source(file_path: str) -> Optional[_ScannedFile]:
+    """Read and tokenize a source file for reference search.
+    
+    Line boundaries follow str.splitlines; the line start offsets let later
+    matches against the whole buffer be mapped back to lines.
+    """
+    content = Path(file_path).read_text(encoding='utf-8')
+    line_starts = [0]
+    tokens: Dict[str, List[Tuple[int, int, int]]] = defaultdict(list)
+    for line_num, line in enumerate(content.splitlines(keepends=True), 1):
+        line_starts.append(line_starts[-1] + len(line))
+        for match in _IDENTIFIER_RE.finditer(line):
+            tokens[match.group()].append((line_num, match.start(), match.end()))
+    return content, line_starts, dict(tokens)
+
 
 class IntelligenceEngine:
     """Advanced code intelligence analysis engine."""
     
-    def __init__(self):
+    def __init__(self, content_cache_size: int = 1024):
+        """
+        Initialize engine.
+        
+        Args:
+            content_cache_size: Maximum number of scanned source files kept for
+                                reference search, keyed by path and validated
+                                against the file's content hash (0 disables)
+        """
         self.intelligence_cache: Dict[str, CodeIntelligence] = {}
+        self.content_cache_size = content_cache_size
+        self._content_cache: "OrderedDict[str, Tuple[str, _ScannedFile]]" = OrderedDict()
         
         # NetworkX available check
         if not nx:
             logger.warning("NetworkX not available. Some graph analysis features will be limited.")
     
-    def analyze_project_intelligence(self, project_id: str, files: Dict[str, UniversalFile]) -> CodeIntelligence:
-        """Perform comprehensive code intelligence analysis on a project."""
+    def analyze_project_intelligence(self, project_id: str, files: Dict[str, UniversalFile], *,
+                                     workers: Optional[int] = None) -> CodeIntelligence:
+        """Perform comprehensive code intelligence analysis on a project.
+        
+        Args:
+            project_id: Identifier the result is cached under
+            files: Analyzed files keyed by path
+            workers: Maximum worker processes for reading source files
+                     (defaults to the CPU count); 1 reads serially
+        """
         logger.info(f"Starting intelligence analysis for project {project_id}")
         
         # Initialize intelligence store
@@ -55,7 +113,7 @@ class IntelligenceEngine:
         self._analyze_relationships(intelligence, files)
         
         # Analyze references
-        self._analyze_references(intelligence, files)
+        self._analyze_references(intelligence, files, workers)
         
         # Build call graph
         self._build_call_graph(intelligence)
@@ -84,13 +142,27 @@ class IntelligenceEngine:
         """Analyze relationships between symbols."""
         logger.debug("Analyzing symbol relationships...")
         
+        # Index symbols by name once so each lookup is a dict hit
+        name_index: Dict[str, List[UniversalNode]] = defaultdict(list)
+        file_index: Dict[Tuple[str, str], UniversalNode] = {}
+        for symbol in intelligence.symbols.values():
+            name_index[symbol.name].append(symbol)
+            file_index.setdefault((symbol.name, symbol.location.file_path), symbol)
+        
+        # (source, target, type) keys already added; a repeat would only
+        # duplicate an existing relationship, ID included
+        seen: Set[Tuple[str, str, RelationType]] = set()
+        
         for file_path, file_obj in files.items():
-            self._analyze_file_relationships(intelligence, file_obj)
+            self._analyze_file_relationships(intelligence, file_obj, name_index, file_index, seen)
         
         # Cross-file relationship analysis
-        self._analyze_cross_file_relationships(intelligence, files)
+        self._analyze_cross_file_relationships(intelligence, files, seen)
     
-    def _analyze_file_relationships(self, intelligence: CodeIntelligence, file_obj: UniversalFile):
+    def _analyze_file_relationships(self, intelligence: CodeIntelligence, file_obj: UniversalFile,
+                                    name_index: Dict[str, List[UniversalNode]],
+                                    file_index: Dict[Tuple[str, str], UniversalNode],
+                                    seen: Set[Tuple[str, str, RelationType]]):
         """Analyze relationships within a single file."""
         nodes = file_obj.nodes
         
@@ -99,55 +171,51 @@ class IntelligenceEngine:
             if node.type == ElementType.CLASS:
                 # Check for extends relationship
                 if node.extends:
-                    target_node = self._find_symbol_by_name(intelligence, node.extends, file_obj.path)
+                    target_node = self._find_symbol_by_name(name_index, file_index, node.extends, file_obj.path)
                     if target_node:
-                        relationship = self._create_relationship(
-                            node.id, target_node.id, RelationType.EXTENDS, node.location
+                        self._add_relationship(
+                            intelligence, seen, node.id, target_node.id, RelationType.EXTENDS, node.location
                         )
-                        intelligence.add_relationship(relationship)
                 
                 # Check for implements relationships
                 for interface_name in node.implements:
-                    target_node = self._find_symbol_by_name(intelligence, interface_name, file_obj.path)
+                    target_node = self._find_symbol_by_name(name_index, file_index, interface_name, file_obj.path)
                     if target_node:
-                        relationship = self._create_relationship(
-                            node.id, target_node.id, RelationType.IMPLEMENTS, node.location
+                        self._add_relationship(
+                            intelligence, seen, node.id, target_node.id, RelationType.IMPLEMENTS, node.location
                         )
-                        intelligence.add_relationship(relationship)
         
         # Analyze containment relationships (parent-child)
         for node in nodes:
             if node.parent_id:
                 parent_node = intelligence.symbols.get(node.parent_id)
                 if parent_node:
-                    relationship = self._create_relationship(
-                        parent_node.id, node.id, RelationType.CONTAINS, node.location
+                    self._add_relationship(
+                        intelligence, seen, parent_node.id, node.id, RelationType.CONTAINS, node.location
                     )
-                    intelligence.add_relationship(relationship)
                     
                     # Reverse relationship
-                    relationship = self._create_relationship(
-                        node.id, parent_node.id, RelationType.CONTAINED_IN, node.location
+                    self._add_relationship(
+                        intelligence, seen, node.id, parent_node.id, RelationType.CONTAINED_IN, node.location
                     )
-                    intelligence.add_relationship(relationship)
         
         # Analyze import relationships
         for import_name in file_obj.imports:
             # Find nodes that might be imported symbols
-            imported_symbols = self._find_imported_symbols(intelligence, import_name)
+            imported_symbols = self._find_imported_symbols(name_index, import_name)
             for symbol in imported_symbols:
                 # Create import relationship from file to symbol
                 file_id = f"file:{file_obj.path}"
-                relationship = self._create_relationship(
-                    file_id, symbol.id, RelationType.IMPORTS, 
-                    location=SourceLocation(
+                self._add_relationship(
+                    intelligence, seen, file_id, symbol.id, RelationType.IMPORTS,
+                    SourceLocation(
                         file_path=file_obj.path,
                         start_line=1, end_line=1, start_column=0, end_column=0
                     )
                 )
-                intelligence.add_relationship(relationship)
     
-    def _analyze_cross_file_relationships(self, intelligence: CodeIntelligence, files: Dict[str, UniversalFile]):
+    def _analyze_cross_file_relationships(self, intelligence: CodeIntelligence, files: Dict[str, UniversalFile],
+                                          seen: Set[Tuple[str, str, RelationType]]):
         """Analyze relationships across different files."""
         # This is where we'd analyze call relationships, but it requires more complex AST analysis
         # For now, we'll implement basic name-based analysis
@@ -158,65 +226,135 @@ class IntelligenceEngine:
                     # Analyze potential calls within the node
                     potential_calls = self._extract_potential_calls(node, intelligence)
                     for called_symbol_id in potential_calls:
-                        relationship = self._create_relationship(
-                            node.id, called_symbol_id, RelationType.CALLS, node.location
+                        self._add_relationship(
+                            intelligence, seen, node.id, called_symbol_id, RelationType.CALLS, node.location
                         )
-                        intelligence.add_relationship(relationship)
     
-    def _analyze_references(self, intelligence: CodeIntelligence, files: Dict[str, UniversalFile]):
-        """Analyze symbol references throughout the codebase."""
+    def _analyze_references(self, intelligence: CodeIntelligence, files: Dict[str, UniversalFile],
+                            workers: Optional[int] = None):
+        """Analyze symbol references throughout the codebase.
+        
+        Each file is read and tokenized once; every identifier token is looked
+        up in a name index of all symbols, instead of searching every file
+        once per symbol.
+        """
         logger.debug("Analyzing symbol references...")
         
-        # For each symbol, find all potential references
-        for symbol_id, symbol in intelligence.symbols.items():
+        # An identifier-like name matches \bname\b exactly where it is a whole
+        # \w+ token; other names keep their own whole-word pattern
+        symbols_by_name: Dict[str, List[UniversalNode]] = defaultdict(list)
+        other_symbols: Dict[str, List[UniversalNode]] = defaultdict(list)
+        for symbol in intelligence.symbols.values():
             if not symbol.name:
                 continue
-                
-            # Search for references in all files
-            for file_path, file_obj in files.items():
-                refs = self._find_references_in_file(symbol, file_obj)
-                for ref in refs:
-                    intelligence.add_reference(ref)
-    
-    @analysis_operation(default_return=[])
-    def _find_references_in_file(self, symbol: UniversalNode, file_obj: UniversalFile) -> List[Reference]:
-        """Find references to a symbol within a file."""
-        references = []
-        
-        if not symbol.name:
-            return references
-        
-        # Simple name-based reference finding
-        # In a production system, this would use more sophisticated AST analysis
-        content = Path(file_obj.path).read_text(encoding='utf-8')
-        lines = content.splitlines()
-        
-        for line_num, line in enumerate(lines, 1):
-            # Find all occurrences of the symbol name
-            for match in re.finditer(r'\b' + re.escape(symbol.name) + r'\b', line):
-                # Skip if this is the definition location
-                if (file_obj.path == symbol.location.file_path and 
-                    line_num == symbol.location.start_line):
+            if _IDENTIFIER_RE.fullmatch(symbol.name):
+                symbols_by_name[symbol.name].append(symbol)
+            else:
+                other_symbols[symbol.name].append(symbol)
+        
+        # Every \w+ run inside such a name is also a whole token wherever the
+        # name matches, so a file lacking any of them cannot contain the name
+        other_parts = {name: _IDENTIFIER_RE.findall(name) for name in other_symbols}
+        
+        found: Dict[str, List[Reference]] = defaultdict(list)
+        file_objs = list(files.values())
+        for file_obj, scanned in zip(file_objs, self._scan_files(file_objs, workers), strict=True):
+            if scanned is None:
+                continue
+            content, line_starts, tokens = scanned
+            
+            for name, positions in tokens.items():
+                symbols = symbols_by_name.get(name)
+                if symbols:
+                    for symbol in symbols:
+                        for line_num, start, end in positions:
+                            self._collect_reference(
+                                found, symbol, file_obj.path, content, line_starts, line_num, start, end
+                            )
+            
+            # Token and substring checks rule out most names before any regex
+            # runs; the rest scan the whole buffer once
+            for name, symbols in other_symbols.items():
+                if not all(part in tokens for part in other_parts[name]) or name not in content:
                     continue
-                
-                ref_id = self._generate_reference_id(symbol.id, file_obj.path, line_num, match.start())
-                
-                reference = Reference(
-                    id=ref_id,
-                    symbol_id=symbol.id,
-                    location=SourceLocation(
-                        file_path=file_obj.path,
-                        start_line=line_num,
-                        end_line=line_num,
-                        start_column=match.start(),
-                        end_column=match.end()
-                    ),
-                    kind="reference",  # Could be enhanced to detect read/write/call
-                    context=line.strip()
-                )
-                references.append(reference)
+                for match in _compile_name(name).finditer(content):
+                    line_num = bisect_right(line_starts, match.start())
+                    line_start = line_starts[line_num - 1]
+                    for symbol in symbols:
+                        self._collect_reference(
+                            found, symbol, file_obj.path, content, line_starts, line_num,
+                            match.start() - line_start, match.end() - line_start
+                        )
+        
+        # Store per symbol, in symbol order, as a per-symbol search would
+        for symbol_id in intelligence.symbols:
+            refs = found.get(symbol_id)
+            if refs:
+                intelligence.add_references(symbol_id, refs)
+    
+    def _scan_files(self, file_objs: List[UniversalFile],
+                    workers: Optional[int] = None) -> List[Optional[_ScannedFile]]:
+        """Read and tokenize source files for reference search.
+        
+        Scans are cached by path and reused while the file's content hash is
+        unchanged, so re-analyzing a project only re-reads files that changed.
+        Files that do need reading are independent, so a large batch of them is
+        spread across a process pool. Unreadable files scan as None.
+        """
+        scans: List[Optional[_ScannedFile]] = []
+        for file_obj in file_objs:
+            cached = self._content_cache.get(file_obj.path)
+            if cached is not None and file_obj.hash and cached[0] == file_obj.hash:
+                self._content_cache.move_to_end(file_obj.path)
+                scans.append(cached[1])
+            else:
+                scans.append(None)
+        
+        missing = [i for i, scanned in enumerate(scans) if scanned is None]
+        paths = [file_objs[i].path for i in missing]
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        if workers == 1 or len(paths) < _PARALLEL_SCAN_MIN_FILES:
+            fresh = [_scan_source(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                fresh = list(executor.map(_scan_source, paths, chunksize=8))
+        
+        for i, scanned in zip(missing, fresh, strict=True):
+            scans[i] = scanned
+            file_obj = file_objs[i]
+            if scanned is not None and self.content_cache_size > 0 and file_obj.hash:
+                self._content_cache[file_obj.path] = (file_obj.hash, scanned)
+                self._content_cache.move_to_end(file_obj.path)
+                if len(self._content_cache) > self.content_cache_size:
+                    self._content_cache.popitem(last=False)
+        
+        return scans
+    
+    def _collect_reference(self, found: Dict[str, List[Reference]], symbol: UniversalNode,
+                           file_path: str, content: str, line_starts: List[int],
+                           line_num: int, start: int, end: int):
+        """Record a name match as a reference to ``symbol``, unless it is the definition line."""
+        # Skip if this is the definition location
+        if file_path == symbol.location.file_path and line_num == symbol.location.start_line:
+            return
         
-        return references
+        ref_id = self._generate_reference_id(symbol.id, file_path, line_num, start)
+        
+        found[symbol.id].append(Reference(
+            id=ref_id,
+            symbol_id=symbol.id,
+            location=SourceLocation(
+                file_path=file_path,
+                start_line=line_num,
+                end_line=line_num,
+                start_column=start,
+                end_column=end
+            ),
+            kind="reference",  # Could be enhanced to detect read/write/call
+            context=content[line_starts[line_num - 1]:line_starts[line_num]].strip()
+        ))
     
     def _extract_potential_calls(self, node: UniversalNode, intelligence: CodeIntelligence) -> List[str]:
         """Extract potential function calls from a node."""
@@ -237,10 +375,7 @@ class IntelligenceEngine:
         logger.debug("Building call graph...")
         
         # Extract call relationships
-        call_relationships = [
-            rel for rel in intelligence.relationships 
-            if rel.type == RelationType.CALLS
-        ]
+        call_relationships = intelligence.get_relationships_by_type(RelationType.CALLS)
         
         # Build call graph nodes
         for symbol_id, symbol in intelligence.symbols.items():
@@ -272,25 +407,25 @@ class IntelligenceEngine:
         G = nx.DiGraph()
         
         # Add nodes and edges
-        for node in intelligence.dependency_graph.nodes:
-            G.add_node(node)
-        
-        for source, target, rel_type in intelligence.dependency_graph.edges:
-            G.add_edge(source, target, relation=rel_type.value)
+        G.add_nodes_from(intelligence.dependency_graph.nodes)
+        G.add_edges_from(
+            (source, target, {"relation": rel_type.value})
+            for source, target, rel_type in intelligence.dependency_graph.edges
+        )
         
         # Compute metrics
-        if G.nodes():
-            intelligence.dependency_graph.total_nodes = len(G.nodes())
-            intelligence.dependency_graph.total_edges = len(G.edges())
+        if G.number_of_nodes():
+            intelligence.dependency_graph.total_nodes = G.number_of_nodes()
+            intelligence.dependency_graph.total_edges = G.number_of_edges()
             intelligence.dependency_graph.density = nx.density(G)
             intelligence.dependency_graph.strongly_connected_components = nx.number_strongly_connected_components(G)
             
-            # Find cycles
+            # Find cycles; simple_cycles is lazy, so stop after the first 10
+            # instead of enumerating every cycle (exponential in the worst case)
             try:
-                cycles = list(nx.simple_cycles(G))
-                intelligence.dependency_graph.cycles = cycles[:10]  # Limit to first 10 cycles
-            except:
-                pass  # Cycle detection can be expensive
+                intelligence.dependency_graph.cycles = list(islice(nx.simple_cycles(G), 10))
+            except Exception as e:
+                logger.debug(f"Cycle detection failed: {e}")
             
             # Store in intelligence metrics
             intelligence.metrics["graph_metrics"] = {
@@ -306,34 +441,49 @@ class IntelligenceEngine:
         if symbol_id not in intelligence.symbols:
             return {"error": "Symbol not found"}
         
+        # Index dependents and per-file symbol spans once instead of scanning
+        # every relationship and symbol for each visited node
+        dependency_types = {
+            RelationType.CALLS, RelationType.USES, RelationType.IMPORTS,
+            RelationType.EXTENDS, RelationType.IMPLEMENTS
+        }
+        dependents_index: Dict[str, List[str]] = defaultdict(list)
+        for rel in intelligence.relationships:
+            if rel.type in dependency_types:
+                dependents_index[rel.target_id].append(rel.source_id)
+        
+        spans_by_file: Dict[str, List[Tuple[int, int, str]]] = defaultdict(list)
+        for sym in intelligence.symbols.values():
+            spans_by_file[sym.location.file_path].append(
+                (sym.location.start_line, sym.location.end_line, sym.id)
+            )
+        for spans in spans_by_file.values():
+            spans.sort()
+        
         impacted = set()
-        queue = [(symbol_id, 0)]
+        queue = deque([(symbol_id, 0)])
         
         while queue:
-            current_id, depth = queue.pop(0)
+            current_id, depth = queue.popleft()
             
             if depth > max_depth:
                 continue
             
             # Find all symbols that depend on current symbol
-            dependents = intelligence.get_dependents(current_id)
-            for dependent_id in dependents:
+            for dependent_id in dependents_index.get(current_id, ()):
                 if dependent_id not in impacted:
                     impacted.add(dependent_id)
                     queue.append((dependent_id, depth + 1))
             
             # Also consider references
-            references = intelligence.get_symbol_references(current_id)
-            for ref in references:
-                # Find symbol containing this reference
-                containing_symbols = [
-                    sym for sym in intelligence.symbols.values()
-                    if (sym.location.file_path == ref.location.file_path and
-                        sym.location.start_line <= ref.location.start_line <= sym.location.end_line)
-                ]
-                for sym in containing_symbols:
-                    if sym.id not in impacted:
-                        impacted.add(sym.id)
+            for ref in intelligence.get_symbol_references(current_id):
+                # Find symbols containing this reference: only spans starting
+                # at or before the reference line can contain it
+                spans = spans_by_file.get(ref.location.file_path, ())
+                line = ref.location.start_line
+                for _, end_line, sym_id in spans[:bisect_right(spans, (line, float('inf')))]:
+                    if end_line >= line:
+                        impacted.add(sym_id)
         
         # Calculate impact metrics
         impacted_files = set()
@@ -354,36 +504,41 @@ class IntelligenceEngine:
         if symbol_id not in intelligence.call_graph:
             return {"error": "Symbol not found in call graph"}
         
+        # Breadth-first, so each symbol is reported at its shortest call depth;
+        # calls are only followed (and emitted as edges) above the depth limit
         visited = set()
         nodes = []
         edges = []
+        queue = deque([(symbol_id, 0)])
         
-        def traverse(current_id: str, current_depth: int):
-            if current_depth > depth or current_id in visited:
-                return
+        while queue:
+            current_id, current_depth = queue.popleft()
+            if current_id in visited:
+                continue
             
             visited.add(current_id)
             call_node = intelligence.call_graph.get(current_id)
-            if call_node:
-                nodes.append({
-                    "id": current_id,
-                    "name": call_node.symbol_name,
-                    "type": call_node.symbol_type.name,
-                    "file": call_node.file_path,
-                    "complexity": call_node.complexity,
-                    "depth": current_depth
-                })
-                
-                # Add outgoing calls
+            if not call_node:
+                continue
+            
+            nodes.append({
+                "id": current_id,
+                "name": call_node.symbol_name,
+                "type": call_node.symbol_type.name,
+                "file": call_node.file_path,
+                "complexity": call_node.complexity,
+                "depth": current_depth
+            })
+            
+            # Add outgoing calls
+            if current_depth < depth:
                 for called_id in call_node.calls:
                     edges.append({
                         "source": current_id,
                         "target": called_id,
                         "type": "calls"
                     })
-                    traverse(called_id, current_depth + 1)
-        
-        traverse(symbol_id, 0)
+                    queue.append((called_id, current_depth + 1))
         
         return {
             "nodes": nodes,
@@ -393,42 +548,41 @@ class IntelligenceEngine:
         }
     
     # Helper methods
-    def _find_symbol_by_name(self, intelligence: CodeIntelligence, name: str, file_path: str) -> Optional[UniversalNode]:
+    def _find_symbol_by_name(self, name_index: Dict[str, List[UniversalNode]],
+                             file_index: Dict[Tuple[str, str], UniversalNode],
+                             name: str, file_path: str) -> Optional[UniversalNode]:
         """Find a symbol by name, preferring symbols in the same file."""
-        candidates = []
-        
-        for symbol in intelligence.symbols.values():
-            if symbol.name == name:
-                candidates.append(symbol)
-        
-        # Prefer symbols in the same file
-        same_file_candidates = [s for s in candidates if s.location.file_path == file_path]
-        if same_file_candidates:
-            return same_file_candidates[0]
+        same_file = file_index.get((name, file_path))
+        if same_file:
+            return same_file
         
         # Return first candidate if any
+        candidates = name_index.get(name)
         return candidates[0] if candidates else None
     
-    def _find_imported_symbols(self, intelligence: CodeIntelligence, import_name: str) -> List[UniversalNode]:
+    def _find_imported_symbols(self, name_index: Dict[str, List[UniversalNode]],
+                               import_name: str) -> List[UniversalNode]:
         """Find symbols that might match an import statement."""
-        # Simplified import resolution
-        symbols = []
-        
-        # Look for exact name matches
-        for symbol in intelligence.symbols.values():
-            if symbol.name == import_name:
-                symbols.append(symbol)
+        # Simplified import resolution: exact name matches first
+        symbols = list(name_index.get(import_name, ()))
         
-        # Look for module-level matches
+        # Then module-level matches on the last dotted part
         module_parts = import_name.split('.')
         if len(module_parts) > 1:
-            last_part = module_parts[-1]
-            for symbol in intelligence.symbols.values():
-                if symbol.name == last_part:
-                    symbols.append(symbol)
+            symbols.extend(name_index.get(module_parts[-1], ()))
         
         return symbols
     
+    def _add_relationship(self, intelligence: CodeIntelligence, seen: Set[Tuple[str, str, RelationType]],
+                          source_id: str, target_id: str, rel_type: RelationType,
+                          location: Optional[SourceLocation] = None):
+        """Add a relationship unless the same (source, target, type) was already added."""
+        key = (source_id, target_id, rel_type)
+        if key in seen:
+            return
+        seen.add(key)
+        intelligence.add_relationship(self._create_relationship(source_id, target_id, rel_type, location))
+    
     def _create_relationship(self, source_id: str, target_id: str, rel_type: RelationType, 
                            location: Optional[SourceLocation] = None) -> Relationship:
         """Create a relationship between two symbols."""
@@ -1,6 +1,9 @@
 """Universal analyzer for multi-language code analysis."""
 
 import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -11,6 +14,54 @@ from ..models.universal import Language, UniversalFile
 
 logger = logging.getLogger(__name__)
 
+# File extension -> language for discovery and adapter selection
+_EXTENSION_MAP: Dict[str, Language] = {
+    '.py': Language.PYTHON,
+    '.pyw': Language.PYTHON,
+    '.js': Language.JAVASCRIPT,
+    '.mjs': Language.JAVASCRIPT,
+    '.jsx': Language.JAVASCRIPT,
+    '.ts': Language.TYPESCRIPT,
+    '.tsx': Language.TYPESCRIPT,
+    '.go': Language.GO,
+    '.rs': Language.RUST,
+    '.c': Language.C,
+    '.h': Language.C,
+    '.cpp': Language.CPP,
+    '.cc': Language.CPP,
+    '.cxx': Language.CPP,
+    '.hpp': Language.CPP,
+    '.java': Language.JAVA,
+    '.cs': Language.CSHARP,
+    '.rb': Language.RUBY,
+    '.php': Language.PHP,
+    '.swift': Language.SWIFT,
+    '.kt': Language.KOTLIN,
+    '.scala': Language.SCALA,
+    '.html': Language.HTML,
+    '.htm': Language.HTML,
+    '.css': Language.CSS,
+    '.sql': Language.SQL,
+}
+
+# Directory names never descended into during discovery
+_EXCLUDED_DIRS = frozenset({'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'dist', 'build'})
+
+# Below this many files a process pool costs more than it saves, and serial
+# analysis can use this process's adapter caches
+_PARALLEL_ANALYZE_MIN_FILES = 32
+
+# Analyzer reused by analyze_files() worker processes (one per process)
+_worker_analyzer: Optional['UniversalAnalyzer'] = None
+
+
+def _analyze_one(file_path: Path) -> Optional[UniversalFile]:
+    """Analyze a single file inside a worker process."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = UniversalAnalyzer()
+    return _worker_analyzer.analyze_file(file_path)
+
 
 class UniversalAnalyzer:
     """Main analyzer that uses appropriate language adapters."""
@@ -93,7 +144,7 @@ class UniversalAnalyzer:
             universal_file.metadata["language_detected"] = language.value
             
             # Cache result
-            self._file_cache[str(file_path)] = universal_file
+            self._file_cache[sys.intern(str(file_path))] = universal_file
             
             return universal_file
             
@@ -101,64 +152,74 @@ class UniversalAnalyzer:
             logger.error(f"Failed to analyze {file_path}: {e}")
             return None
     
-    def analyze_directory(self, directory: Path) -> Dict[str, UniversalFile]:
-        """Analyze all files in a directory recursively."""
-        results = {}
+    def analyze_files(self, file_paths: List[Path], *,
+                      workers: Optional[int] = None) -> Dict[str, UniversalFile]:
+        """Analyze many files, fanning out across processes.
+        
+        Files are independent and parsing holds the GIL, so bulk analysis
+        scales with a process pool; each worker builds its own analyzer.
+        Results keep the input order and files that fail are left out.
+        
+        Args:
+            file_paths: Files to analyze
+            workers: Maximum worker processes (defaults to the CPU count);
+                     1 analyzes serially in this process, as does any batch
+                     smaller than _PARALLEL_ANALYZE_MIN_FILES
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
         
-        for file_path in self._discover_files(directory):
-            result = self.analyze_file(file_path)
+        if workers == 1 or len(file_paths) < _PARALLEL_ANALYZE_MIN_FILES:
+            analyzed = [self.analyze_file(file_path) for file_path in file_paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                analyzed = list(executor.map(_analyze_one, file_paths, chunksize=16))
+        
+        results = {}
+        for file_path, result in zip(file_paths, analyzed, strict=True):
             if result:
-                results[str(file_path)] = result
+                # One interned key shared by the result and the cache
+                key = sys.intern(str(file_path))
+                results[key] = result
+                self._file_cache[key] = result
         
         return results
     
+    def analyze_directory(self, directory: Path, *,
+                          workers: Optional[int] = None) -> Dict[str, UniversalFile]:
+        """Analyze all files in a directory recursively (see analyze_files)."""
+        return self.analyze_files(self.discover_files(directory), workers=workers)
+    
     def _detect_language(self, file_path: Path) -> Language:
         """Detect language from file extension."""
-        extension_map = {
-            '.py': Language.PYTHON,
-            '.pyw': Language.PYTHON,
-            '.js': Language.JAVASCRIPT,
-            '.mjs': Language.JAVASCRIPT,
-            '.jsx': Language.JAVASCRIPT,
-            '.ts': Language.TYPESCRIPT,
-            '.tsx': Language.TYPESCRIPT,
-            '.go': Language.GO,
-            '.rs': Language.RUST,
-            '.c': Language.C,
-            '.h': Language.C,
-            '.cpp': Language.CPP,
-            '.cc': Language.CPP,
-            '.cxx': Language.CPP,
-            '.hpp': Language.CPP,
-            '.java': Language.JAVA,
-            '.cs': Language.CSHARP,
-            '.rb': Language.RUBY,
-            '.php': Language.PHP,
-            '.swift': Language.SWIFT,
-            '.kt': Language.KOTLIN,
-            '.scala': Language.SCALA,
-            '.html': Language.HTML,
-            '.htm': Language.HTML,
-            '.css': Language.CSS,
-            '.sql': Language.SQL,
-        }
-        
-        suffix = file_path.suffix.lower()
-        return extension_map.get(suffix, Language.UNKNOWN)
+        return _EXTENSION_MAP.get(file_path.suffix.lower(), Language.UNKNOWN)
     
-    def _discover_files(self, directory: Path) -> List[Path]:
-        """Discover all analyzable files in directory."""
-        excluded_dirs = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', 'dist', 'build'}
+    def discover_files(self, directory: Path) -> List[Path]:
+        """Discover all analyzable files in directory.
+        
+        Walks with os.scandir and never descends into excluded directories
+        (or symlinked ones). Directories are visited in pre-order, listing
+        each directory's files before its subdirectories, the same order
+        Path.rglob produces.
+        """
         files = []
+        stack = [str(directory)]
         
-        for file_path in directory.rglob('*'):
-            if file_path.is_file():
-                # Skip if in excluded directory
-                if any(part in excluded_dirs for part in file_path.parts):
-                    continue
-                
-                # Check if file is analyzable
-                if self._detect_language(file_path) != Language.UNKNOWN:
-                    files.append(file_path)
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIRS:
+                        subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in _EXTENSION_MAP and entry.is_file():
+                    files.append(Path(entry.path))
+            
+            stack.extend(reversed(subdirs))
         
         return files
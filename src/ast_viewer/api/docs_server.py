@@ -1,73 +1,64 @@
 """Documentation server for GraphQL API with enhanced features."""
 
 from pathlib import Path
-from typing import Dict, Any
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
 import json
+import logging
+import textwrap
+import threading
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
+from graphql import execute_sync, parse
 from strawberry.fastapi import GraphQLRouter
 
 from ..graphql.modern_schema import create_schema
 from ..graphql.docs_generator import GraphQLDocumentationGenerator
 from ..graphql.integration import get_graphql_context
 
+logger = logging.getLogger(__name__)
 
-class GraphQLDocsServer:
-    """Enhanced documentation server for GraphQL API."""
-    
-    def __init__(self, docs_dir: str = "docs/graphql"):
-        self.docs_dir = Path(docs_dir)
-        self.docs_dir.mkdir(parents=True, exist_ok=True)
-        self.generator = GraphQLDocumentationGenerator(str(self.docs_dir))
-        self.app = FastAPI(
-            title="AST Viewer GraphQL API Documentation",
-            description="Interactive documentation and playground for the AST Viewer Code Intelligence API",
-            version="2.0.0"
-        )
-        self._setup_routes()
-        
-    def _setup_routes(self):
-        """Set up documentation routes."""
-        
-        @self.app.get("/", response_class=HTMLResponse)
-        async def docs_home():
-            """Main documentation page."""
-            # Generate fresh interactive docs
-            docs_file = self.generator.generate_interactive_docs()
-            with open(docs_file, 'r') as f:
-                return f.read()
-        
-        @self.app.get("/playground", response_class=HTMLResponse)
-        async def graphql_playground():
-            """Advanced GraphQL Playground with enhanced features."""
-            return """
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>AST Viewer GraphQL Playground</title>
-                <link href="https://cdn.jsdelivr.net/npm/graphql-playground-react@1.7.28/build/static/css/index.css" rel="stylesheet" />
-            </head>
-            <body>
-                <div id="root">
-                    <style>
-                        body { margin: 0; height: 100vh; overflow: hidden; }
-                        #root { height: 100vh; }
-                    </style>
-                </div>
-                <script src="https://cdn.jsdelivr.net/npm/graphql-playground-react@1.7.28/build/static/js/middleware.js"></script>
-                <script>
-                    window.addEventListener('load', function (event) {
-                        GraphQLPlayground.init(document.getElementById('root'), {
-                            endpoint: '/graphql',
-                            settings: {
-                                'request.credentials': 'include',
-                            },
-                            tabs: [
-                                {
-                                    endpoint: '/graphql',
-                                    query: `# Welcome to AST Viewer GraphQL Playground
+# Type information served by /api/types
+_TYPES_QUERY = """
+query {
+    __schema {
+        types {
+            name
+            kind
+            description
+            fields {
+                name
+                description
+                type {
+                    name
+                    kind
+                }
+            }
+            inputFields {
+                name
+                description
+                type {
+                    name
+                    kind
+                }
+            }
+            enumValues {
+                name
+                description
+            }
+        }
+    }
+}
+"""
+# Parsed once; the schema is executed against this document directly
+_TYPES_DOCUMENT = parse(_TYPES_QUERY)
+
+
+# Example queries preloaded into the playground tab
+_PLAYGROUND_EXAMPLES = """# Welcome to AST Viewer GraphQL Playground
 # 
 # Here are some example queries to get you started:
 
@@ -132,7 +123,39 @@ query SchemaInfo {
       description
     }
   }
-}`
+}"""
+
+# Playground page; constant, so it is built and encoded once at import
+_PLAYGROUND_HTML = (
+    textwrap.dedent("""\
+            <!DOCTYPE html>
+            <html>
+            <head>
+                <title>AST Viewer GraphQL Playground</title>
+                <link href="https://cdn.jsdelivr.net/npm/graphql-playground-react@1.7.28/build/static/css/index.css" rel="stylesheet" />
+            </head>
+            <body>
+                <div id="root">
+                    <style>
+                        body { margin: 0; height: 100vh; overflow: hidden; }
+                        #root { height: 100vh; }
+                    </style>
+                </div>
+                <script src="https://cdn.jsdelivr.net/npm/graphql-playground-react@1.7.28/build/static/js/middleware.js"></script>
+                <script>
+                    window.addEventListener('load', function (event) {
+                        GraphQLPlayground.init(document.getElementById('root'), {
+                            endpoint: '/graphql',
+                            settings: {
+                                'request.credentials': 'include',
+                            },
+                            tabs: [
+                                {
+                                    endpoint: '/graphql',
+                                    query: `""")
+    + _PLAYGROUND_EXAMPLES
+    + "`"
+    + textwrap.dedent("""
                                 }
                             ]
                         })
@@ -140,100 +163,224 @@ query SchemaInfo {
                 </script>
             </body>
             </html>
-            """
+            """)
+).encode("utf-8")
+
+# Docs artifacts only change on refresh(); clients revalidate with the ETag
+_CACHE_CONTROL = "public, max-age=3600"
+
+
+def _columns(rows: Optional[List[Dict[str, Any]]], **columns: Callable[[Dict[str, Any]], Any]
+             ) -> Optional[Dict[str, List[Any]]]:
+    """Turn a list of rows into one list per column; None stays None."""
+    if rows is None:
+        return None
+    return {name: [get(row) for row in rows] for name, get in columns.items()}
+
+
+def _columnar_types(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reshape the /api/types introspection result into parallel arrays.
+    
+    Entry ``i`` of every top-level list describes the same type; its fields,
+    input fields and enum values are themselves column groups (or None).
+    """
+    field_columns = dict(
+        names=itemgetter("name"),
+        descriptions=itemgetter("description"),
+        type_names=lambda field: field["type"]["name"],
+        type_kinds=lambda field: field["type"]["kind"],
+    )
+    types = data["__schema"]["types"]
+    return {
+        "names": [t["name"] for t in types],
+        "kinds": [t["kind"] for t in types],
+        "descriptions": [t["description"] for t in types],
+        "fields": [_columns(t["fields"], **field_columns) for t in types],
+        "input_fields": [_columns(t["inputFields"], **field_columns) for t in types],
+        "enum_values": [
+            _columns(t["enumValues"], names=itemgetter("name"), descriptions=itemgetter("description"))
+            for t in types
+        ],
+    }
+
+
+def _matches_etag(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names ``etag``."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _encode_json(content: Any) -> bytes:
+    """Encode JSON the way JSONResponse does, for payloads built once and sent as-is."""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class GraphQLDocsServer:
+    """Enhanced documentation server for GraphQL API."""
+    
+    def __init__(self, docs_dir: str = "docs/graphql"):
+        self.docs_dir = Path(docs_dir)
+        self._docs_dir_str = str(self.docs_dir)
+        # Building the schema is costly and it never changes; share one instance
+        self.schema = create_schema()
+        # The generator creates docs_dir; artifacts are written on first request
+        self.generator = GraphQLDocumentationGenerator(self._docs_dir_str, schema=self.schema)
+        self.app = FastAPI(
+            title="AST Viewer GraphQL API Documentation",
+            description="Interactive documentation and playground for the AST Viewer Code Intelligence API",
+            version="2.0.0"
+        )
+        self._artifacts: Dict[str, Tuple[bytes, Dict[str, str]]] = {}
+        # Disk-backed handlers run in the thread pool; one build at a time
+        # keeps concurrent first requests from writing the same file twice
+        self._build_lock = threading.Lock()
+        self._setup_routes()
+    
+    def refresh(self):
+        """Drop the generated artifacts so each is rebuilt on its next request.
+        
+        The schema is fixed for the life of the process, so artifacts are
+        otherwise built once. Call this to pick up changes.
+        """
+        self._artifacts.clear()
+    
+    def _artifact(self, name: str, build: Callable[[], bytes]) -> Tuple[bytes, Dict[str, str]]:
+        """Return an artifact and its cache headers, building it on first use.
+        
+        A failed build only fails the route that asked for it, and is retried
+        on the next request.
+        """
+        cached = self._artifacts.get(name)
+        if cached is not None:
+            return cached
+        
+        with self._build_lock:
+            cached = self._artifacts.get(name)
+            if cached is None:
+                try:
+                    content = build()
+                except Exception as e:
+                    logger.error(f"Failed to generate docs artifact {name}: {e}")
+                    raise HTTPException(status_code=500, detail=f"Failed to generate {name}") from e
+                # Strong ETag per artifact, so clients and proxies can revalidate
+                # cheaply until the next refresh
+                etag = f'"{hashlib.sha256(content).hexdigest()}"'
+                cached = (content, {"ETag": etag, "Cache-Control": _CACHE_CONTROL})
+                self._artifacts[name] = cached
+        return cached
+    
+    def _serve(self, request: Request, name: str, build: Callable[[], bytes], media_type: str,
+               filename: Optional[str] = None) -> Response:
+        """Serve an artifact, or a 304 if the client's copy is current.
+        
+        ``filename`` serves it as a download.
+        """
+        content, headers = self._artifact(name, build)
+        if _matches_etag(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if filename:
+            headers = {**headers, "Content-Disposition": f'attachment; filename="{filename}"'}
+        return Response(content=content, media_type=media_type, headers=headers)
+    
+    def _build_types_payload(self, format: str) -> bytes:
+        """Run the type introspection query and serialize it in ``format``."""
+        result = execute_sync(self.schema._schema, _TYPES_DOCUMENT)
+        if result.errors:
+            raise result.errors[0]
+        return _encode_json(_columnar_types(result.data) if format == "columnar" else result.data)
+    
+    def _build_queries_payload(self) -> bytes:
+        """List the Query fields and their arguments and serialize them."""
+        query_type = self.schema._schema.type_map.get("Query")
+        
+        queries = []
+        if query_type is not None:
+            queries = [
+                {
+                    "name": field_name,
+                    "description": field.description,
+                    "args": [
+                        {
+                            "name": arg_name,
+                            "type": str(arg.type),
+                            "description": arg.description
+                        }
+                        for arg_name, arg in field.args.items()
+                    ]
+                }
+                for field_name, field in query_type.fields.items()
+            ]
+        
+        return _encode_json({"queries": queries})
+        
+    def _setup_routes(self):
+        """Set up documentation routes."""
+        # Handlers whose artifact is generated and read from disk are plain
+        # def, so FastAPI runs them in its thread pool instead of blocking the
+        # event loop on first use; the rest only build in-memory payloads
+        
+        @self.app.get("/", response_class=HTMLResponse)
+        def docs_home(request: Request):
+            """Main documentation page."""
+            return self._serve(request, "interactive.html",
+                               lambda: Path(self.generator.generate_interactive_docs()).read_bytes(),
+                               "text/html")
+        
+        @self.app.get("/playground", response_class=HTMLResponse)
+        async def graphql_playground(request: Request):
+            """Advanced GraphQL Playground with enhanced features."""
+            return self._serve(request, "playground", lambda: _PLAYGROUND_HTML, "text/html")
         
         @self.app.get("/schema.graphql")
-        async def get_schema_sdl():
+        def get_schema_sdl(request: Request):
             """Download GraphQL Schema Definition Language."""
-            schema_file = self.generator.generate_schema_sdl()
-            return FileResponse(schema_file, media_type="text/plain", filename="schema.graphql")
+            return self._serve(request, "schema.graphql",
+                               lambda: Path(self.generator.generate_schema_sdl()).read_bytes(),
+                               "text/plain", filename="schema.graphql")
         
         @self.app.get("/schema.json")
-        async def get_schema_json():
+        def get_schema_json(request: Request):
             """Download GraphQL Schema as JSON."""
-            schema_file = self.generator.generate_schema_json()
-            return FileResponse(schema_file, media_type="application/json", filename="schema.json")
+            return self._serve(request, "schema.json",
+                               lambda: Path(self.generator.generate_schema_json()).read_bytes(),
+                               "application/json", filename="schema.json")
         
         @self.app.get("/examples.md")
-        async def get_examples():
+        def get_examples(request: Request):
             """Download example queries."""
-            examples_file = self.generator.generate_example_queries()
-            return FileResponse(examples_file, media_type="text/markdown", filename="examples.md")
+            return self._serve(request, "examples.md",
+                               lambda: Path(self.generator.generate_example_queries()).read_bytes(),
+                               "text/markdown", filename="examples.md")
         
         @self.app.get("/postman")
-        async def get_postman_collection():
+        def get_postman_collection(request: Request):
             """Download Postman collection."""
-            collection_file = self.generator.generate_postman_collection()
-            return FileResponse(collection_file, media_type="application/json", filename="ast_viewer_api.postman_collection.json")
+            return self._serve(request, "postman",
+                               lambda: Path(self.generator.generate_postman_collection()).read_bytes(),
+                               "application/json", filename="ast_viewer_api.postman_collection.json")
         
         @self.app.get("/api/types")
-        async def get_type_definitions():
-            """Get GraphQL type definitions as JSON."""
-            # This is useful for code generators and IDE extensions
-            from strawberry.printer import print_schema
-            from strawberry.schema.execute import execute_sync
-            
-            schema = create_schema()
+        async def get_type_definitions(request: Request, format: str = "nested"):
+            """Get GraphQL type definitions as JSON.
             
-            # Get type information
-            introspection_query = """
-            query {
-                __schema {
-                    types {
-                        name
-                        kind
-                        description
-                        fields {
-                            name
-                            description
-                            type {
-                                name
-                                kind
-                            }
-                        }
-                        inputFields {
-                            name
-                            description
-                            type {
-                                name
-                                kind
-                            }
-                        }
-                        enumValues {
-                            name
-                            description
-                        }
-                    }
-                }
-            }
+            ``format=columnar`` returns the same data as parallel arrays,
+            which is smaller and cheaper to decode than the nested shape.
             """
-            
-            result = execute_sync(schema, introspection_query)
-            return JSONResponse(content=result.data)
+            # This is useful for code generators and IDE extensions
+            if format not in ("nested", "columnar"):
+                raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+            return self._serve(request, f"types.{format}", lambda: self._build_types_payload(format),
+                               "application/json")
         
         @self.app.get("/api/queries")
-        async def get_available_queries():
+        async def get_available_queries(request: Request):
             """Get list of available queries with descriptions."""
-            schema = create_schema()
-            query_type = schema.schema.type_map.get("Query")
-            
-            queries = []
-            if query_type and hasattr(query_type, 'fields'):
-                for field_name, field in query_type.fields.items():
-                    queries.append({
-                        "name": field_name,
-                        "description": getattr(field, 'description', None),
-                        "args": [
-                            {
-                                "name": arg_name,
-                                "type": str(arg.type),
-                                "description": getattr(arg, 'description', None)
-                            }
-                            for arg_name, arg in getattr(field, 'args', {}).items()
-                        ]
-                    })
-            
-            return JSONResponse(content={"queries": queries})
+            return self._serve(request, "queries", self._build_queries_payload, "application/json")
         
         @self.app.get("/health")
         async def docs_health():
@@ -241,13 +388,11 @@ query SchemaInfo {
             return {"status": "healthy", "service": "graphql-docs"}
         
         # Mount GraphQL endpoint for testing
-        schema = create_schema()
-        graphql_app = GraphQLRouter(schema, context_getter=get_graphql_context)
+        graphql_app = GraphQLRouter(self.schema, context_getter=get_graphql_context)
         self.app.include_router(graphql_app, prefix="/graphql")
         
         # Serve static documentation files
-        if self.docs_dir.exists():
-            self.app.mount("/static", StaticFiles(directory=str(self.docs_dir)), name="static")
+        self.app.mount("/static", StaticFiles(directory=self._docs_dir_str), name="static")
 
 
 def create_docs_app() -> FastAPI:
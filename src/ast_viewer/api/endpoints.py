@@ -493,9 +493,11 @@ async def analyze_project(
         analysis_result = integrated_analyzer.analyze_project(project_path, project_name)
         analysis_time = time.time() - start_time
         
-        # Convert to API response format
+        # Convert to API response format; files are dumped on access, so only
+        # index the mapping once a path has passed the filters
+        analyzed_files = analysis_result['files']
         files = []
-        for file_path, file_data in analysis_result['files'].items():
+        for file_path in analyzed_files:
             # Apply filters
             if request.file_extensions:
                 if not any(file_path.endswith(ext) for ext in request.file_extensions):
@@ -509,6 +511,7 @@ async def analyze_project(
                 break
             
             # Convert file data
+            file_data = analyzed_files[file_path]
             file_result = FileAnalysisResult(
                 path=file_path,
                 language=LanguageEnum(file_data.get('language', 'UNKNOWN')),
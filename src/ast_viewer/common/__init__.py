@@ -6,6 +6,7 @@ from .errors import handle_errors, DatabaseError, AnalysisError
 from .metrics import ComplexityCalculator, MetricsCollector
 from .language_utils import LanguageDetector, detect_language
 from .identifiers import IDGenerator, generate_node_id, generate_file_hash
+from .disk_cache import DiskCache
 
 __all__ = [
     # Database utilities
@@ -31,5 +32,8 @@ __all__ = [
     # ID generation utilities
     "IDGenerator",
     "generate_node_id",
-    "generate_file_hash"
+    "generate_file_hash",
+    
+    # Persistent caching utilities
+    "DiskCache",
 ]
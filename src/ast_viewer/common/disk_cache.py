@@ -0,0 +1,89 @@
+"""Persistent on-disk cache for analysis results.
+
+Entries are pickled one file per key under a directory that is namespaced by
+cache kind, package version and Python version, so upgrading either simply
+starts a fresh cache instead of loading incompatible objects.
+
+The cache is opt-in: it is enabled by pointing ``AST_VIEWER_CACHE_DIR`` at a
+writable directory. Only point it at directories you control, since entries
+are unpickled on load.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .errors import handle_errors, ErrorSeverity
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR = "AST_VIEWER_CACHE_DIR"
+
+
+class DiskCache:
+    """Pickle-per-entry cache stored under a versioned directory."""
+
+    def __init__(self, cache_dir: Union[str, Path], namespace: str):
+        """
+        Initialize cache rooted at ``cache_dir``.
+
+        Args:
+            cache_dir: Base directory for all caches
+            namespace: Sub-directory for this kind of entry (e.g. "python")
+        """
+        from .. import __version__
+
+        python_version = f"py{sys.version_info[0]}{sys.version_info[1]}"
+        self.directory = Path(cache_dir) / namespace / f"{__version__}-{python_version}"
+
+    @classmethod
+    def from_env(cls, namespace: str) -> Optional['DiskCache']:
+        """Create a cache from ``AST_VIEWER_CACHE_DIR``, or None if unset."""
+        cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+        if not cache_dir:
+            return None
+        return cls(cache_dir, namespace)
+
+    def _entry_path(self, *key_parts: Any) -> Path:
+        """Map key parts to a file path (sha256 of the joined parts)."""
+        key = '\0'.join(str(part) for part in key_parts)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.pkl"
+
+    @handle_errors(default_return=None, custom_message="Failed to read disk cache entry",
+                   log_level=ErrorSeverity.DEBUG)
+    def get(self, *key_parts: Any) -> Optional[Any]:
+        """Return the cached value for the key, or None on a miss."""
+        entry_path = self._entry_path(*key_parts)
+        try:
+            with open(entry_path, 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+    @handle_errors(default_return=False, custom_message="Failed to write disk cache entry",
+                   log_level=ErrorSeverity.WARNING)
+    def put(self, value: Any, *key_parts: Any) -> bool:
+        """Store a value for the key; the write is atomic per entry."""
+        entry_path = self._entry_path(*key_parts)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry of this cache version."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -31,8 +31,8 @@ class IDGenerator:
         id_parts = [str(part) for part in parts if part is not None]
         id_string = ':'.join(id_parts)
         
-        # Generate consistent 16-character hash
-        return hashlib.md5(id_string.encode('utf-8')).hexdigest()[:16]
+        # Generate consistent 16-character hash (hex of the first 8 digest bytes)
+        return hashlib.md5(id_string.encode('utf-8')).digest()[:8].hex()
     
     @staticmethod
     def generate_file_hash(content: Union[str, bytes]) -> str:
@@ -53,21 +53,22 @@ class IDGenerator:
     def generate_relationship_id(source_id: str, target_id: str, rel_type: str) -> str:
         """Generate consistent relationship IDs.
         
-        This replaces the pattern in intelligence.py:439.
+        This replaces the pattern in intelligence.py:439. Formats the key
+        directly rather than through generate_node_id, since it runs once per
+        relationship; the result is identical.
         """
-        return IDGenerator.generate_node_id(source_id, target_id, rel_type)
+        return hashlib.md5(f"{source_id}:{target_id}:{rel_type}".encode('utf-8')).digest()[:8].hex()
     
     @staticmethod
     def generate_reference_id(symbol_id: str, file_path: Union[str, Path], 
                             line: int, column: int) -> str:
         """Generate consistent reference IDs.
         
-        This replaces the pattern in intelligence.py:452.
+        This replaces the pattern in intelligence.py:452. Like
+        generate_relationship_id it formats the key directly, as it runs once
+        per reference.
         """
-        if isinstance(file_path, Path):
-            file_path = str(file_path)
-        
-        return IDGenerator.generate_node_id(symbol_id, file_path, line, column)
+        return hashlib.md5(f"{symbol_id}:{file_path}:{line}:{column}".encode('utf-8')).digest()[:8].hex()
     
     @staticmethod
     def generate_project_id(project_name: str, owner: Optional[str] = None) -> str:
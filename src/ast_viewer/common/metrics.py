@@ -6,6 +6,7 @@ duplication across adapters (python.py, tree_sitter.py, intelligence.py).
 DRY Fix: Eliminates repeated complexity calculation logic.
 """
 
+import functools
 import logging
 from typing import Dict, Any, List, Optional, Union
 from enum import Enum
@@ -14,6 +15,27 @@ from dataclasses import dataclass
 logger = logging.getLogger(__name__)
 
 
+# Decision points that increase cyclomatic complexity (matched as substrings
+# of node type names and counted in node content)
+DECISION_KEYWORDS = frozenset({
+    'if', 'elif', 'else', 'while', 'for', 'try', 'except',
+    'finally', 'with', 'and', 'or', 'case', 'switch', 'catch'
+})
+
+# Node types that add a decision point of their own
+BRANCH_NODE_TYPES = frozenset({'if_statement', 'while_loop', 'for_loop', 'try_statement'})
+
+
+@functools.lru_cache(maxsize=None)
+def is_decision_type(node_type: str) -> bool:
+    """Check whether a node type name contains a decision keyword.
+    
+    Results are cached per type name; grammars only have a few hundred.
+    """
+    node_type = node_type.lower()
+    return any(decision in node_type for decision in DECISION_KEYWORDS)
+
+
 class ComplexityType(Enum):
     """Types of complexity metrics."""
     CYCLOMATIC = "cyclomatic"
@@ -44,35 +66,37 @@ class ComplexityCalculator:
         
         This was duplicated in python.py and tree_sitter.py adapters.
         """
-        complexity = 1  # Base complexity
-        
-        # Decision points that increase complexity
-        decision_keywords = {
-            'if', 'elif', 'else', 'while', 'for', 'try', 'except', 
-            'finally', 'with', 'and', 'or', 'case', 'switch', 'catch'
-        }
+        decision_keywords = DECISION_KEYWORDS
         
         # Extract relevant data
-        node_type = node_data.get('type', '').lower()
+        node_type = node_data.get('type', '')
         content = node_data.get('content', '')
         children = node_data.get('children', [])
         
+        # Base complexity plus specific node types and decision children
+        decision_children = sum(
+            1 for child in children
+            if isinstance(child, dict) and is_decision_type(child.get('type', ''))
+        )
+        complexity = ComplexityCalculator.calculate_cyclomatic_from_counts(node_type, decision_children)
+        
         # Count decision points in content
         if isinstance(content, str):
             for keyword in decision_keywords:
                 complexity += content.lower().count(keyword)
         
-        # Add complexity from specific node types
-        if node_type in ['if_statement', 'while_loop', 'for_loop', 'try_statement']:
-            complexity += 1
-        
-        # Add complexity from children
-        for child in children:
-            if isinstance(child, dict):
-                child_type = child.get('type', '').lower()
-                if any(decision in child_type for decision in decision_keywords):
-                    complexity += 1
+        return complexity
+    
+    @staticmethod
+    def calculate_cyclomatic_from_counts(node_type: str, decision_children: int) -> float:
+        """Calculate cyclomatic complexity from a node type and its number of decision children.
         
+        Lets tree walkers count decision children as they go (see is_decision_type)
+        instead of building child dicts for calculate_cyclomatic_complexity.
+        """
+        complexity = 1 + decision_children
+        if node_type.lower() in BRANCH_NODE_TYPES:
+            complexity += 1
         return float(complexity)
     
     @staticmethod
@@ -19,8 +19,8 @@ from .integration import GraphQLUsageExamples
 class GraphQLDocumentationGenerator:
     """Generate comprehensive GraphQL API documentation."""
     
-    def __init__(self, output_dir: str = "docs/graphql"):
-        self.schema = create_schema()
+    def __init__(self, output_dir: str = "docs/graphql", schema: Optional[strawberry.Schema] = None):
+        self.schema = schema if schema is not None else create_schema()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
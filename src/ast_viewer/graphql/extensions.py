@@ -4,7 +4,7 @@ import time
 import logging
 import uuid
 from typing import Dict, Any, Optional
-from strawberry.extensions import Extension
+from strawberry.extensions import Extension, ParserCache, ValidationCache
 from strawberry.types import ExecutionResult
 
 logger = logging.getLogger(__name__)
@@ -218,12 +218,23 @@ def create_extensions(
     enable_validation: bool = True,
     enable_error_tracking: bool = True,
     enable_caching: bool = False,
+    enable_query_cache: bool = False,
     slow_query_threshold: float = 1.0,
-    max_query_depth: int = 10
+    max_query_depth: int = 10,
+    query_cache_size: int = 1024
 ) -> list:
-    """Create a list of extensions based on configuration."""
+    """Create a list of extensions based on configuration.
+    
+    ``enable_query_cache`` keeps LRU caches of parsed and validated query
+    documents, keyed by query text, so repeated queries skip graphql-core's
+    parse and validation steps.
+    """
     extensions = []
     
+    if enable_query_cache:
+        extensions.append(ParserCache(maxsize=query_cache_size))
+        extensions.append(ValidationCache(maxsize=query_cache_size))
+    
     if enable_logging:
         extensions.append(LoggingExtension(include_variables=False))
     
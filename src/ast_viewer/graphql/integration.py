@@ -257,6 +257,7 @@ def get_production_schema():
             enable_logging=True,
             enable_performance=True,
             enable_validation=True,
+            enable_query_cache=True,
             enable_error_tracking=True,
             enable_caching=True,  # Enable caching in production
             slow_query_threshold=1.0,  # Stricter threshold for production
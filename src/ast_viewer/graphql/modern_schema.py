@@ -510,6 +510,7 @@ def create_schema():
             enable_logging=True,
             enable_performance=True,
             enable_validation=True,
+            enable_query_cache=True,
             slow_query_threshold=2.0,
             max_query_depth=15
         )
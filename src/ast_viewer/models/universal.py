@@ -5,11 +5,12 @@ This module defines the core data structures used across all language adapters
 to provide a unified representation of code elements using Pydantic models.
 """
 
-from typing import Dict, List, Optional, Set, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Set, Any, Tuple
 from enum import Enum, auto
+from functools import lru_cache
 import ast
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class ElementType(Enum):
@@ -82,27 +83,33 @@ class Language(Enum):
     @property
     def tree_sitter_parser(self):
         """Get Tree-sitter Language object for language if available."""
-        try:
-            import tree_sitter
-            
-            if self == Language.PYTHON:
-                import tree_sitter_python
-                return tree_sitter.Language(tree_sitter_python.language())
-            elif self == Language.JAVASCRIPT:
-                import tree_sitter_javascript
-                return tree_sitter.Language(tree_sitter_javascript.language())
-            elif self == Language.TYPESCRIPT:
-                import tree_sitter_typescript
-                return tree_sitter.Language(tree_sitter_typescript.language_tsx())
-            elif self == Language.GO:
-                import tree_sitter_go
-                return tree_sitter.Language(tree_sitter_go.language())
-            elif self == Language.RUST:
-                import tree_sitter_rust
-                return tree_sitter.Language(tree_sitter_rust.language())
-        except ImportError:
-            pass
-        return None
+        return _load_tree_sitter_language(self)
+
+
+@lru_cache(maxsize=None)
+def _load_tree_sitter_language(language: Language):
+    """Load a Tree-sitter grammar once per language (see Language.tree_sitter_parser)."""
+    try:
+        import tree_sitter
+        
+        if language == Language.PYTHON:
+            import tree_sitter_python
+            return tree_sitter.Language(tree_sitter_python.language())
+        elif language == Language.JAVASCRIPT:
+            import tree_sitter_javascript
+            return tree_sitter.Language(tree_sitter_javascript.language())
+        elif language == Language.TYPESCRIPT:
+            import tree_sitter_typescript
+            return tree_sitter.Language(tree_sitter_typescript.language_tsx())
+        elif language == Language.GO:
+            import tree_sitter_go
+            return tree_sitter.Language(tree_sitter_go.language())
+        elif language == Language.RUST:
+            import tree_sitter_rust
+            return tree_sitter.Language(tree_sitter_rust.language())
+    except ImportError:
+        pass
+    return None
 
 
 class AccessLevel(Enum):
@@ -252,6 +259,15 @@ class UniversalFile(BaseModel):
         # Update metrics
         if node.location.end_line > self.total_lines:
             self.total_lines = node.location.end_line
+    
+    def extend_nodes(self, nodes: Iterable[UniversalNode]) -> None:
+        """Add many nodes to this file at once."""
+        start = len(self.nodes)
+        self.nodes.extend(nodes)
+        # Update metrics
+        end_line = max((node.location.end_line for node in self.nodes[start:]), default=0)
+        if end_line > self.total_lines:
+            self.total_lines = end_line
 
 
 class RelationType(Enum):
@@ -367,6 +383,15 @@ class CodeIntelligence(BaseModel):
     # Computed intelligence
     metrics: Dict[str, Any] = Field(default_factory=dict)
     
+    # Relationships grouped by type, for the list object and length last indexed
+    _relationships_by_type: Dict[RelationType, List[Relationship]] = PrivateAttr(default_factory=dict)
+    _indexed_list: Optional[List[Relationship]] = PrivateAttr(default=None)
+    _indexed_relationships: int = PrivateAttr(default=0)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Start indexing relationships by type from construction."""
+        self._indexed_list = self.relationships
+    
     def add_symbol(self, symbol: UniversalNode):
         """Add a symbol to the intelligence store."""
         self.symbols[symbol.id] = symbol
@@ -374,6 +399,10 @@ class CodeIntelligence(BaseModel):
     def add_relationship(self, relationship: Relationship):
         """Add a relationship between symbols."""
         self.relationships.append(relationship)
+        if (self._indexed_list is self.relationships and
+                self._indexed_relationships == len(self.relationships) - 1):
+            self._relationships_by_type.setdefault(relationship.type, []).append(relationship)
+            self._indexed_relationships += 1
         
         # Update dependency graph
         if not self.dependency_graph:
@@ -390,10 +419,26 @@ class CodeIntelligence(BaseModel):
             self.references[reference.symbol_id] = []
         self.references[reference.symbol_id].append(reference)
     
+    def add_references(self, symbol_id: str, references: Iterable[Reference]):
+        """Add several references to one symbol in a single extend."""
+        self.references.setdefault(symbol_id, []).extend(references)
+    
     def get_symbol_references(self, symbol_id: str) -> List[Reference]:
         """Get all references to a symbol."""
         return self.references.get(symbol_id, [])
     
+    def get_relationships_by_type(self, relationship_type: RelationType) -> List[Relationship]:
+        """Get all relationships of one type, in the order they were added."""
+        if (self._indexed_list is not self.relationships or
+                self._indexed_relationships != len(self.relationships)):
+            # Relationships were set without add_relationship; re-index
+            self._relationships_by_type = {}
+            for rel in self.relationships:
+                self._relationships_by_type.setdefault(rel.type, []).append(rel)
+            self._indexed_list = self.relationships
+            self._indexed_relationships = len(self.relationships)
+        return self._relationships_by_type.get(relationship_type, [])
+    
     def get_symbol_relationships(self, symbol_id: str, 
                                relationship_types: Optional[List[RelationType]] = None) -> List[Relationship]:
         """Get relationships involving a symbol."""
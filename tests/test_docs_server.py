@@ -0,0 +1,156 @@
+"""
+Tests for the GraphQL documentation server.
+===========================================
+
+Drives GraphQLDocsServer's ASGI app directly, so no HTTP client is needed.
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+docs_server = pytest.importorskip("src.ast_viewer.api.docs_server", exc_type=ImportError)
+
+
+def _get(app, url, headers=None):
+    """Send one GET through the ASGI app; returns (status, headers, body)."""
+    path, _, query = url.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "server": ("testserver", 80), "client": ("testclient", 50000),
+        "headers": [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}, body
+
+
+@pytest.fixture
+def docs_dir(tmp_path):
+    """Output directory for one server."""
+    return tmp_path / "docs"
+
+
+@pytest.fixture
+def server(docs_dir):
+    """A docs server writing into a temporary directory."""
+    return docs_server.GraphQLDocsServer(str(docs_dir))
+
+
+@pytest.mark.unit
+class TestGraphQLDocsServerArtifacts:
+    """Behaviour of the lazily built documentation artifacts."""
+
+    def test_init_should_not_generate_artifacts(self, server, docs_dir):
+        assert list(docs_dir.iterdir()) == []
+
+    def test_failed_artifact_should_only_fail_its_route(self, server, monkeypatch):
+        def broken():
+            raise RuntimeError("boom")
+        monkeypatch.setattr(server.generator, "generate_schema_json", broken)
+
+        assert _get(server.app, "/schema.json")[0] == 500
+        assert _get(server.app, "/playground")[0] == 200
+        assert "schema.json" not in server._artifacts
+
+    def test_download_should_serve_generated_file(self, server, docs_dir):
+        status, headers, body = _get(server.app, "/examples.md")
+
+        assert status == 200
+        assert headers["content-disposition"] == 'attachment; filename="examples.md"'
+        assert body == (docs_dir / "examples.md").read_bytes()
+
+    def test_disk_artifacts_should_be_built_once_off_the_event_loop(self, server, monkeypatch):
+        generate = server.generator.generate_example_queries
+        build_threads = []
+
+        def slow_generate():
+            build_threads.append(threading.current_thread())
+            time.sleep(0.05)
+            return generate()
+        monkeypatch.setattr(server.generator, "generate_example_queries", slow_generate)
+
+        requests = [threading.Thread(target=_get, args=(server.app, "/examples.md")) for _ in range(3)]
+        for request in requests:
+            request.start()
+        for request in requests:
+            request.join()
+
+        assert len(build_threads) == 1
+        assert build_threads[0] not in requests
+
+    def test_refresh_should_drop_built_artifacts(self, server):
+        _get(server.app, "/playground")
+
+        server.refresh()
+
+        assert server._artifacts == {}
+
+
+@pytest.mark.unit
+class TestGraphQLDocsServerCaching:
+    """Behaviour of the ETag / If-None-Match handling."""
+
+    def test_matching_etag_should_return_not_modified(self, server):
+        status, headers, _ = _get(server.app, "/playground")
+
+        revalidated = _get(server.app, "/playground", {"If-None-Match": headers["etag"]})
+        weak = _get(server.app, "/playground", {"If-None-Match": f'"other", W/{headers["etag"]}'})
+
+        assert status == 200
+        assert headers["cache-control"] == docs_server._CACHE_CONTROL
+        assert (revalidated[0], revalidated[2]) == (304, b"")
+        assert weak[0] == 304
+
+    def test_stale_etag_should_return_content(self, server):
+        status, _, body = _get(server.app, "/playground", {"If-None-Match": '"stale"'})
+
+        assert status == 200
+        assert body == docs_server._PLAYGROUND_HTML
+
+
+@pytest.mark.unit
+class TestGraphQLDocsServerTypes:
+    """Behaviour of /api/types."""
+
+    def test_columnar_format_should_match_nested_types(self, server):
+        nested = json.loads(_get(server.app, "/api/types")[2])
+        columnar = json.loads(_get(server.app, "/api/types?format=columnar")[2])
+        types = nested["__schema"]["types"]
+
+        assert columnar["names"] == [t["name"] for t in types]
+        assert columnar["kinds"] == [t["kind"] for t in types]
+        assert [c and c["names"] for c in columnar["fields"]] == [
+            t["fields"] and [f["name"] for f in t["fields"]] for t in types
+        ]
+
+    def test_unknown_format_should_be_rejected(self, server):
+        assert _get(server.app, "/api/types?format=xml")[0] == 400
+
+
+@pytest.mark.unit
+class TestGraphQLDocsServerQueries:
+    """Behaviour of /api/queries."""
+
+    def test_queries_should_list_query_fields_and_arguments(self, server):
+        status, _, body = _get(server.app, "/api/queries")
+        query_type = server.schema._schema.type_map["Query"]
+
+        queries = json.loads(body)["queries"]
+        assert status == 200
+        assert [q["name"] for q in queries] == list(query_type.fields)
+        assert all(isinstance(q["args"], list) for q in queries)
+        assert any(q["args"] for q in queries)
@@ -0,0 +1,101 @@
+"""
+Tests for the integrated analyzer.
+==================================
+
+Covers project-level analysis through IntegratedCodeAnalyzer.analyze_project.
+"""
+
+import io
+import json
+
+import pytest
+
+from src.ast_viewer.analyzers.integrated import IntegratedCodeAnalyzer
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    """A small two-module Python project."""
+    (tmp_path / "util.py").write_text("def helper():\n    return 1\n")
+    (tmp_path / "main.py").write_text("import util\n\ndef run():\n    return util.helper()\n")
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestIntegratedCodeAnalyzerAnalyzeProject:
+    """Behaviour of IntegratedCodeAnalyzer.analyze_project."""
+
+    def test_analyze_project_should_resolve_local_imports(self, project_dir):
+        result = IntegratedCodeAnalyzer().analyze_project(project_dir)
+
+        assert result['dependencies'] == {str(project_dir / "main.py"): [str(project_dir / "util.py")]}
+        assert result['metrics']['total_files'] == 2
+        assert result['files'][str(project_dir / "util.py")]['total_lines'] == 2
+
+    def test_files_should_only_dump_entries_that_are_read(self, project_dir):
+        files = IntegratedCodeAnalyzer().analyze_project(project_dir)['files']
+
+        paths = list(files)
+        assert files._dumped == {}
+        assert files[str(project_dir / "util.py")]['total_lines'] == 2
+        assert sorted(paths) == [str(project_dir / "main.py"), str(project_dir / "util.py")]
+        assert list(files._dumped) == [str(project_dir / "util.py")]
+
+    def test_files_write_json_should_match_json_dump_of_each_file(self, project_dir):
+        files = IntegratedCodeAnalyzer().analyze_project(project_dir)['files']
+        stream = io.BytesIO()
+
+        files.write_json(stream)
+
+        assert json.loads(stream.getvalue()) == {
+            path: file_analysis.model_dump(mode="json") for path, file_analysis in files._file_analyses.items()
+        }
+        assert list(json.loads(stream.getvalue())) == list(files)
+
+    def test_analyze_project_should_reuse_result_for_unchanged_project(self, project_dir, monkeypatch):
+        analyzer = IntegratedCodeAnalyzer()
+        first = analyzer.analyze_project(project_dir)
+
+        monkeypatch.setattr(analyzer.universal_analyzer, "analyze_files",
+                            lambda *args, **kwargs: pytest.fail("project re-analyzed"))
+        second = analyzer.analyze_project(project_dir)
+
+        assert second['metrics'] == first['metrics']
+
+    def test_analyze_project_should_not_share_memoized_result_with_callers(self, project_dir):
+        analyzer = IntegratedCodeAnalyzer()
+        util = str(project_dir / "util.py")
+        first = analyzer.analyze_project(project_dir)
+        expected_dependencies = dict(first['dependencies'])
+
+        first['metrics']['total_files'] = -1
+        first['dependencies'].clear()
+        first['files'][util]['total_lines'] = -1
+        second = analyzer.analyze_project(project_dir)
+        second['project']['children'].clear()
+        third = analyzer.analyze_project(project_dir)
+
+        assert third['metrics']['total_files'] == 2
+        assert third['dependencies'] == expected_dependencies
+        assert third['files'][util]['total_lines'] == 2
+        assert third['project']['children']
+
+    def test_analyze_project_should_reanalyze_changed_project(self, project_dir):
+        analyzer = IntegratedCodeAnalyzer()
+        analyzer.analyze_project(project_dir)
+
+        (project_dir / "util.py").write_text("def helper():\n    return 1\n\n\ndef other():\n    return 2\n")
+        result = analyzer.analyze_project(project_dir)
+
+        assert result['files'][str(project_dir / "util.py")]['total_lines'] == 6
+
+    def test_analyze_project_should_evict_least_recently_used_results(self, project_dir, tmp_path_factory):
+        other_dir = tmp_path_factory.mktemp("other")
+        (other_dir / "solo.py").write_text("x = 1\n")
+        analyzer = IntegratedCodeAnalyzer(project_cache_size=1)
+
+        analyzer.analyze_project(project_dir, "first")
+        analyzer.analyze_project(other_dir, "second")
+
+        assert list(analyzer._project_results) == ["project:second"]
+        assert list(analyzer._project_results["project:second"][2]) == [str(other_dir / "solo.py")]
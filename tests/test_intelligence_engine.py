@@ -0,0 +1,190 @@
+"""
+Tests for the code intelligence engine.
+=======================================
+
+Covers symbol reference search performed by
+IntelligenceEngine.analyze_project_intelligence.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.ast_viewer.analyzers.intelligence import IntelligenceEngine
+from src.ast_viewer.models.universal import (
+    CallGraphNode,
+    CodeIntelligence,
+    ElementType,
+    Language,
+    RelationType,
+    SourceLocation,
+    UniversalFile,
+    UniversalNode,
+)
+
+
+def _symbol(name, file_path, line, element_type=ElementType.FUNCTION):
+    """A symbol defined on a single line."""
+    return UniversalNode(
+        id=f"{name}@{file_path}:{line}",
+        type=element_type,
+        name=name,
+        language=Language.PYTHON,
+        location=SourceLocation(file_path=file_path, start_line=line, end_line=line),
+    )
+
+
+@pytest.fixture
+def project_files(tmp_path):
+    """Two files whose symbols refer to each other."""
+    util = tmp_path / "util.py"
+    util.write_text("def helper():\n    return helper_value\n\nconfig.path = 1\n")
+    main = tmp_path / "main.py"
+    main.write_text("from util import helper\n\nx = helper() + helper()\ny = config.path\n")
+
+    files = {}
+    for path, nodes in [
+        (util, [_symbol("helper", str(util), 1), _symbol("config.path", str(util), 4, ElementType.VARIABLE)]),
+        (main, [_symbol("x", str(main), 3, ElementType.VARIABLE)]),
+    ]:
+        universal_file = UniversalFile(path=str(path), language=Language.PYTHON)
+        universal_file.extend_nodes(nodes)
+        files[str(path)] = universal_file
+    return files
+
+
+@pytest.mark.unit
+class TestIntelligenceEngineReferences:
+    """Behaviour of the name-based reference search."""
+
+    def test_references_should_match_whole_identifiers_outside_definition_line(self, project_files):
+        intelligence = IntelligenceEngine().analyze_project_intelligence("p", project_files)
+        util, main = project_files
+
+        refs = intelligence.get_symbol_references(f"helper@{util}:1")
+
+        assert [(Path(r.location.file_path).name, r.location.start_line, r.location.start_column)
+                for r in refs] == [("main.py", 1, 17), ("main.py", 3, 4), ("main.py", 3, 15)]
+        assert refs[1].context == "x = helper() + helper()"
+
+    def test_references_should_match_dotted_names(self, project_files):
+        intelligence = IntelligenceEngine().analyze_project_intelligence("p", project_files)
+        util, main = project_files
+
+        refs = intelligence.get_symbol_references(f"config.path@{util}:4")
+
+        assert [(Path(r.location.file_path).name, r.location.start_line) for r in refs] == [("main.py", 4)]
+
+    def test_references_should_skip_unreadable_files(self, project_files):
+        util, main = project_files
+        Path(main).unlink()
+
+        intelligence = IntelligenceEngine().analyze_project_intelligence("p", project_files)
+
+        assert intelligence.get_symbol_references(f"helper@{util}:1") == []
+
+    def test_references_should_reuse_scans_until_content_hash_changes(self, project_files):
+        engine = IntelligenceEngine()
+        util, main = project_files
+        project_files[main].hash = "v1"
+        engine.analyze_project_intelligence("p", project_files)
+
+        Path(main).write_text("helper()\n")
+        cached = engine.analyze_project_intelligence("p", project_files)
+        project_files[main].hash = "v2"
+        rescanned = engine.analyze_project_intelligence("p", project_files)
+
+        assert len(cached.get_symbol_references(f"helper@{util}:1")) == 3
+        assert [r.context for r in rescanned.get_symbol_references(f"helper@{util}:1")] == ["helper()"]
+
+    def test_references_should_match_serial_scan_across_workers(self, project_files, monkeypatch):
+        monkeypatch.setattr("src.ast_viewer.analyzers.intelligence._PARALLEL_SCAN_MIN_FILES", 0)
+        util, main = project_files
+
+        parallel = IntelligenceEngine().analyze_project_intelligence("p", project_files, workers=2)
+        serial = IntelligenceEngine().analyze_project_intelligence("p", project_files, workers=1)
+
+        assert parallel.get_symbol_references(f"helper@{util}:1") == \
+            serial.get_symbol_references(f"helper@{util}:1")
+        assert len(parallel.get_symbol_references(f"helper@{util}:1")) == 3
+
+    def test_analyze_impact_should_include_symbols_containing_references(self, project_files):
+        engine = IntelligenceEngine()
+        intelligence = engine.analyze_project_intelligence("p", project_files)
+        util, main = project_files
+
+        impact = engine.analyze_impact(intelligence, f"helper@{util}:1")
+
+        assert impact["impacted_symbols"] == [f"x@{main}:3"]
+        assert impact["impacted_file_paths"] == [main]
+
+
+@pytest.mark.unit
+class TestIntelligenceEngineRelationships:
+    """Behaviour of name-based relationship resolution."""
+
+    def test_extends_should_prefer_base_class_from_same_file(self, tmp_path):
+        files = {}
+        for name in ("a.py", "b.py"):
+            path = str(tmp_path / name)
+            base = _symbol("Base", path, 1, ElementType.CLASS)
+            child = _symbol("Child", path, 2, ElementType.CLASS)
+            child.extends = "Base"
+            universal_file = UniversalFile(path=path, language=Language.PYTHON, imports=["pkg.Base"])
+            universal_file.extend_nodes([base, child])
+            files[path] = universal_file
+        a, b = files
+
+        intelligence = IntelligenceEngine().analyze_project_intelligence("p", files)
+        extends = {(r.source_id, r.target_id) for r in intelligence.relationships
+                   if r.type == RelationType.EXTENDS}
+        imports = [r.target_id for r in intelligence.relationships
+                   if r.type == RelationType.IMPORTS and r.source_id == f"file:{a}"]
+
+        assert extends == {(f"Child@{a}:2", f"Base@{a}:1"), (f"Child@{b}:2", f"Base@{b}:1")}
+        assert imports == [f"Base@{a}:1", f"Base@{b}:1"]
+
+    def test_relationships_should_not_repeat_source_target_and_type(self, tmp_path):
+        path = str(tmp_path / "a.py")
+        universal_file = UniversalFile(path=path, language=Language.PYTHON, imports=["Base", "pkg.Base"])
+        universal_file.extend_nodes([_symbol("Base", path, 1, ElementType.CLASS)])
+
+        intelligence = IntelligenceEngine().analyze_project_intelligence("p", {path: universal_file})
+
+        assert [(r.source_id, r.target_id) for r in intelligence.relationships
+                if r.type == RelationType.IMPORTS] == [(f"file:{path}", f"Base@{path}:1")]
+        assert len({r.id for r in intelligence.relationships}) == len(intelligence.relationships)
+
+    def test_relationships_by_type_should_track_added_and_assigned_relationships(self):
+        engine = IntelligenceEngine()
+        intelligence = CodeIntelligence(project_id="p")
+        for source, target, rel_type in [("a", "b", RelationType.CALLS), ("a", "c", RelationType.CONTAINS),
+                                         ("b", "c", RelationType.CALLS)]:
+            intelligence.add_relationship(engine._create_relationship(source, target, rel_type))
+
+        calls = intelligence.get_relationships_by_type(RelationType.CALLS)
+        intelligence.relationships = intelligence.relationships[1:]
+
+        assert [(r.source_id, r.target_id) for r in calls] == [("a", "b"), ("b", "c")]
+        assert [(r.source_id, r.target_id)
+                for r in intelligence.get_relationships_by_type(RelationType.CALLS)] == [("b", "c")]
+
+
+@pytest.mark.unit
+class TestIntelligenceEngineCallGraph:
+    """Behaviour of IntelligenceEngine.get_call_graph."""
+
+    def test_get_call_graph_should_report_shortest_depth_within_limit(self):
+        calls = {"a": ["b", "c"], "b": ["c"], "c": ["d"], "d": ["e"], "e": []}
+        intelligence = CodeIntelligence(project_id="p", call_graph={
+            name: CallGraphNode(symbol_id=name, symbol_name=name, symbol_type=ElementType.FUNCTION,
+                                file_path="/project/calls.py", calls=called)
+            for name, called in calls.items()
+        })
+
+        graph = IntelligenceEngine().get_call_graph(intelligence, "a", depth=2)
+
+        assert [(node["id"], node["depth"]) for node in graph["nodes"]] == [("a", 0), ("b", 1), ("c", 1), ("d", 2)]
+        assert [(edge["source"], edge["target"]) for edge in graph["edges"]] == [
+            ("a", "b"), ("a", "c"), ("b", "c"), ("c", "d")
+        ]
@@ -0,0 +1,196 @@
+"""
+Tests for the Python AST adapter.
+=================================
+
+Covers the single-pass extraction of nodes, imports and metrics performed
+by PythonAdapter.parse_file.
+"""
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from src.ast_viewer.adapters.python import PythonAdapter
+from src.ast_viewer.models.universal import ElementType
+
+
+SAMPLE_SOURCE = textwrap.dedent('''
+    import os
+    from typing import List, Optional
+
+    # module comment
+    CONSTANT = 1
+
+
+    class Base:
+        pass
+
+
+    class Child(Base, pkg.mixins.Mixin):
+        @staticmethod
+        def helper(value: int, items: List[str]) -> Optional[str]:
+            if value and items:
+                return items[0]
+            return None
+
+        async def fetch(self):
+            for item in range(3):
+                import json
+            return json
+
+
+    with open(__file__) as handle:
+        def hidden():
+            return 1
+''')
+
+
+@pytest.fixture
+def parsed_file():
+    """Parse the sample module once per test."""
+    return PythonAdapter().parse_file(Path("/project/sample.py"), SAMPLE_SOURCE)
+
+
+@pytest.mark.unit
+class TestPythonAdapterParseFile:
+    """Behaviour of PythonAdapter.parse_file."""
+
+    def test_parse_file_should_collect_imports_from_whole_tree(self, parsed_file):
+        assert sorted(parsed_file.imports) == ["json", "os", "typing.List", "typing.Optional"]
+
+    def test_parse_file_should_build_node_hierarchy(self, parsed_file):
+        nodes_by_name = {node.name: node for node in parsed_file.nodes if node.name}
+        module = next(node for node in parsed_file.nodes if node.type == ElementType.MODULE)
+
+        assert module.parent_id is None
+        assert nodes_by_name["Child"].parent_id == module.id
+        assert nodes_by_name["helper"].parent_id == nodes_by_name["Child"].id
+        assert nodes_by_name["CONSTANT"].type == ElementType.VARIABLE
+
+    def test_parse_file_should_skip_nodes_below_unmapped_statements(self, parsed_file):
+        names = {node.name for node in parsed_file.nodes}
+
+        assert "hidden" not in names
+
+    def test_parse_file_should_extract_function_properties(self, parsed_file):
+        nodes_by_name = {node.name: node for node in parsed_file.nodes if node.name}
+        helper = nodes_by_name["helper"]
+
+        assert helper.is_static
+        assert helper.return_type == "Optional[str]"
+        assert [p["name"] for p in helper.parameters] == ["value", "items"]
+        assert helper.parameters[1]["type"] == "List[str]"
+        assert nodes_by_name["fetch"].is_async
+        assert nodes_by_name["Child"].extends == "Base"
+        assert nodes_by_name["Child"].implements == {"pkg.mixins.Mixin"}
+
+    def test_parse_file_should_average_complexity_over_all_functions(self, parsed_file):
+        adapter = PythonAdapter()
+        nodes_by_name = {node.name: node for node in parsed_file.nodes if node.name}
+        hidden = adapter.parse_file(Path("/project/hidden.py"), "def hidden():\n    return 1\n")
+
+        # 'hidden' is not emitted as a node but still counts towards file complexity
+        expected = (nodes_by_name["helper"].complexity + nodes_by_name["fetch"].complexity
+                    + hidden.complexity) / 3
+        assert nodes_by_name["helper"].complexity > 1.0
+        assert parsed_file.complexity == pytest.approx(expected)
+        assert adapter.parse_file(Path("/project/empty.py"), "x = 1\n").complexity == 1.0
+
+    def test_parse_file_should_count_lines(self, parsed_file):
+        assert parsed_file.total_lines == len(SAMPLE_SOURCE.splitlines())
+        assert parsed_file.code_lines == 18
+        assert parsed_file.size_bytes == len(SAMPLE_SOURCE.encode("utf-8"))
+
+    def test_parse_file_should_not_retain_ast_nodes(self, parsed_file):
+        assert all(node.raw_node is None for node in parsed_file.nodes)
+
+    def test_parse_file_should_return_none_on_syntax_error(self):
+        assert PythonAdapter().parse_file(Path("/project/broken.py"), "def broken(:\n") is None
+
+
+@pytest.mark.unit
+class TestPythonAdapterParseCache:
+    """Behaviour of the per-instance parse cache."""
+
+    def test_parse_file_should_reuse_cached_result_for_same_content(self):
+        adapter = PythonAdapter()
+        path = Path("/project/sample.py")
+
+        first = adapter.parse_file(path, SAMPLE_SOURCE)
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr("ast.parse", lambda *args, **kwargs: pytest.fail("cache miss"))
+            second = adapter.parse_file(path, SAMPLE_SOURCE)
+
+        assert second.hash == first.hash
+        assert [node.id for node in second.nodes] == [node.id for node in first.nodes]
+
+    def test_parse_file_should_isolate_file_level_mutations(self):
+        adapter = PythonAdapter()
+        path = Path("/project/sample.py")
+
+        first = adapter.parse_file(path, SAMPLE_SOURCE)
+        first.metadata["analyzer_type"] = "Specialized"
+        first.nodes.clear()
+        second = adapter.parse_file(path, SAMPLE_SOURCE)
+
+        assert second.metadata == {}
+        assert second.nodes
+
+    def test_parse_file_should_evict_least_recently_used_entries(self):
+        adapter = PythonAdapter(cache_size=1)
+
+        adapter.parse_file(Path("/project/a.py"), "a = 1\n")
+        adapter.parse_file(Path("/project/b.py"), "b = 1\n")
+
+        assert list(adapter._parse_cache) == [
+            ("/project/b.py", adapter.parse_file(Path("/project/b.py"), "b = 1\n").hash)
+        ]
+
+
+@pytest.mark.unit
+class TestPythonAdapterParseFiles:
+    """Behaviour of PythonAdapter.parse_files."""
+
+    def test_parse_files_should_preserve_order_across_workers(self):
+        items = [(Path(f"/project/mod_{i}.py"), f"def func_{i}():\n    return {i}\n")
+                 for i in range(4)]
+        items.append((Path("/project/broken.py"), "def broken(:\n"))
+
+        results = PythonAdapter().parse_files(items, workers=2)
+
+        assert [r.path if r else None for r in results] == [
+            "/project/mod_0.py", "/project/mod_1.py", "/project/mod_2.py",
+            "/project/mod_3.py", None,
+        ]
+        assert {node.name for node in results[2].nodes if node.name} == {"func_2"}
+
+    def test_parse_files_should_match_serial_parsing(self):
+        items = [(Path("/project/sample.py"), SAMPLE_SOURCE)]
+        adapter = PythonAdapter()
+
+        parallel = adapter.parse_files(items * 2, workers=2)
+        serial = adapter.parse_files(items, workers=1)
+
+        assert parallel[0].model_dump() == serial[0].model_dump()
+
+
+@pytest.mark.unit
+class TestPythonAdapterDiskCache:
+    """Behaviour of the opt-in persistent parse cache."""
+
+    def test_disk_cache_should_be_disabled_without_env_var(self, monkeypatch):
+        monkeypatch.delenv("AST_VIEWER_CACHE_DIR", raising=False)
+
+        assert PythonAdapter()._disk_cache is None
+
+    def test_disk_cache_should_serve_results_to_new_adapters(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("AST_VIEWER_CACHE_DIR", str(tmp_path))
+        path = Path("/project/sample.py")
+
+        first = PythonAdapter().parse_file(path, SAMPLE_SOURCE)
+        monkeypatch.setattr("ast.parse", lambda *args, **kwargs: pytest.fail("cache miss"))
+        second = PythonAdapter().parse_file(path, SAMPLE_SOURCE)
+
+        assert list(tmp_path.rglob("*.pkl"))
+        assert second.model_dump() == first.model_dump()
@@ -0,0 +1,227 @@
+"""
+Tests for the Tree-sitter adapter.
+==================================
+
+Covers multi-language parsing through TreeSitterAdapter.parse_file.
+"""
+
+import textwrap
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("tree_sitter_javascript")
+
+from src.ast_viewer.adapters.tree_sitter import TreeSitterAdapter
+from src.ast_viewer.models.universal import AccessLevel, ElementType
+
+
+JS_SOURCE = textwrap.dedent('''
+    import { readFile } from "fs";
+
+    // Shapes
+    class Shape {
+        area(scale) {
+            if (scale > 1) {
+                return scale * 2;
+            }
+            return 0;
+        }
+    }
+
+    function makeShape(kind) {
+        const shape = new Shape();
+        return shape;
+    }
+
+    export default makeShape;
+''')
+
+
+def _snapshot(universal_file):
+    """Comparable view of a parse result."""
+    return [node.model_dump(exclude={"raw_node"}) for node in universal_file.nodes]
+
+
+@pytest.mark.unit
+class TestTreeSitterAdapterParseFile:
+    """Behaviour of TreeSitterAdapter.parse_file."""
+
+    def test_parse_file_should_collect_imports_and_exports(self):
+        parsed = TreeSitterAdapter().parse_file(Path("/project/shapes.js"), JS_SOURCE)
+
+        assert parsed.imports == ["fs"]
+        assert parsed.exports == ["exported_item"]
+
+    @pytest.mark.parametrize("file_name, source, expected", [
+        ("mods.py", "import a.b as c, d\nfrom ..pkg import (x, y)\n", ["a.b", "d", "..pkg"]),
+        ("mods.ts", "import 'side';\nimport fs = require('fs');\n", ["side", "fs"]),
+        ("mods.go", 'package m\nimport (\n  f "os"\n  "strings"\n)\n', ["os", "strings"]),
+        ("mods.rs", "use std::io::Read;\nuse crate::{a, b};\n", ["std::io::Read", "crate"]),
+    ])
+    def test_parse_file_should_read_module_names_from_import_syntax(self, file_name, source, expected):
+        parsed = TreeSitterAdapter().parse_file(Path("/project") / file_name, source)
+
+        assert parsed.imports == expected
+
+    def test_parse_file_should_count_code_lines(self):
+        source = "// header\r\nconst a = 1;\r\n\r\n  /* block\r\n   * more */\r\nlet b = 2;\fconst c = 3;\n"
+        parsed = TreeSitterAdapter().parse_file(Path("/project/lines.js"), source)
+
+        assert parsed.code_lines == 3
+
+    def test_parse_bytes_should_match_parse_file(self):
+        path = Path("/project/shapes.js")
+
+        from_bytes = TreeSitterAdapter().parse_bytes(path, JS_SOURCE.encode("utf-8"))
+        from_str = TreeSitterAdapter().parse_file(path, JS_SOURCE)
+
+        assert from_bytes.total_lines == len(JS_SOURCE.splitlines())
+        assert from_bytes.model_dump() == from_str.model_dump()
+
+    def test_parse_file_should_link_nested_symbols_to_immediate_parent(self):
+        parsed = TreeSitterAdapter().parse_file(Path("/project/shapes.js"), JS_SOURCE)
+        nodes_by_name = {node.name: node for node in parsed.nodes
+                         if node.name and node.type != ElementType.EXPORT}
+
+        assert nodes_by_name["Shape"].parent_id is None
+        assert nodes_by_name["area"].parent_id == nodes_by_name["Shape"].id
+        assert nodes_by_name["shape"].parent_id == nodes_by_name["makeShape"].id
+        assert nodes_by_name["makeShape"].children_ids == [nodes_by_name["shape"].id]
+
+    def test_parse_file_should_read_modifiers_from_declaration_only(self):
+        source = textwrap.dedent('''
+            class Repo {
+                private static async load() {
+                    const final = 1;
+                }
+            }
+        ''')
+        parsed = TreeSitterAdapter().parse_file(Path("/project/repo.ts"), source)
+        nodes_by_name = {node.name: node for node in parsed.nodes if node.name}
+
+        load = nodes_by_name["load"]
+        assert (load.is_static, load.is_async, load.access_level) == (True, True, AccessLevel.PRIVATE)
+        assert not load.is_const and not load.is_final
+        assert not nodes_by_name["Repo"].is_static
+        assert nodes_by_name["Repo"].access_level is None
+
+    def test_parse_file_should_not_retain_tree_sitter_nodes_by_default(self):
+        path = Path("/project/shapes.js")
+
+        parsed = TreeSitterAdapter().parse_file(path, JS_SOURCE)
+        kept = TreeSitterAdapter(keep_raw_nodes=True).parse_file(path, JS_SOURCE)
+
+        assert all(node.raw_node is None for node in parsed.nodes)
+        assert all(node.raw_node.type == node.tree_sitter_type for node in kept.nodes)
+
+    def test_parse_file_should_raise_cognitive_complexity_with_nesting(self):
+        source = textwrap.dedent('''
+            def outer(a):
+                if a:
+                    def inner(b):
+                        def deepest():
+                            return b
+                        return deepest
+                return 0
+        ''')
+        parsed = TreeSitterAdapter().parse_file(Path("/project/nested.py"), source)
+
+        assert {node.name: node.cognitive_complexity for node in parsed.nodes} == {
+            "outer": 0, "inner": 1, "deepest": 2,
+        }
+
+
+@pytest.mark.unit
+class TestTreeSitterAdapterIncrementalParse:
+    """Behaviour of the incremental re-parse path."""
+
+    def test_parse_file_should_match_fresh_parse_after_edit(self):
+        adapter = TreeSitterAdapter()
+        path = Path("/project/shapes.js")
+        edited = JS_SOURCE.replace("return scale * 2;", "const doubled = scale * 2;\n        return doubled;")
+
+        adapter.parse_file(path, JS_SOURCE)
+        incremental = adapter.parse_file(path, edited)
+        fresh = TreeSitterAdapter().parse_file(path, edited)
+
+        assert _snapshot(incremental) == _snapshot(fresh)
+        assert "doubled" in {node.name for node in incremental.nodes}
+
+    def test_parse_file_should_reuse_tree_for_unchanged_content(self):
+        adapter = TreeSitterAdapter()
+        path = Path("/project/shapes.js")
+
+        adapter.parse_file(path, JS_SOURCE)
+        first_tree = adapter._tree_cache[str(path)][2]
+        adapter.parse_file(path, JS_SOURCE)
+
+        assert adapter._tree_cache[str(path)][2] is first_tree
+
+    def test_invalidate_should_drop_cached_tree(self):
+        adapter = TreeSitterAdapter()
+        path = Path("/project/shapes.js")
+
+        adapter.parse_file(path, JS_SOURCE)
+        adapter.invalidate(path)
+
+        assert str(path) not in adapter._tree_cache
+
+    def test_tree_cache_should_evict_least_recently_used_entries(self):
+        adapter = TreeSitterAdapter(tree_cache_size=1)
+
+        adapter.parse_file(Path("/project/a.js"), "const a = 1;\n")
+        adapter.parse_file(Path("/project/b.js"), "const b = 1;\n")
+
+        assert list(adapter._tree_cache) == ["/project/b.js"]
+
+
+@pytest.mark.unit
+class TestTreeSitterAdapterParseFiles:
+    """Behaviour of TreeSitterAdapter.parse_files."""
+
+    def test_parse_files_should_preserve_order_across_workers(self, tmp_path):
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"mod_{i}.js"
+            path.write_text(f"function func_{i}() {{ return {i}; }}\n")
+            paths.append(path)
+        paths.append(tmp_path / "missing.js")
+
+        results = TreeSitterAdapter().parse_files(paths, workers=2)
+
+        assert [r.path if r else None for r in results] == [str(p) for p in paths[:4]] + [None]
+        assert {node.name for node in results[2].nodes if node.name} == {"func_2"}
+        assert all(node.raw_node is None for node in results[0].nodes)
+
+    def test_parse_files_should_match_serial_parsing(self, tmp_path):
+        path = tmp_path / "shapes.js"
+        path.write_text(JS_SOURCE)
+        adapter = TreeSitterAdapter()
+
+        parallel = adapter.parse_files([path, path], workers=2)
+        serial = adapter.parse_files([path], workers=1)
+
+        assert parallel[0].model_dump() == serial[0].model_dump()
+
+
+@pytest.mark.unit
+class TestTreeSitterAdapterDiskCache:
+    """Behaviour of the opt-in persistent parse cache."""
+
+    def test_disk_cache_should_be_disabled_without_env_var(self, monkeypatch):
+        monkeypatch.delenv("AST_VIEWER_CACHE_DIR", raising=False)
+
+        assert TreeSitterAdapter()._disk_cache is None
+
+    def test_disk_cache_should_serve_results_to_new_adapters(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("AST_VIEWER_CACHE_DIR", str(tmp_path))
+        path = Path("/project/shapes.js")
+
+        first = TreeSitterAdapter().parse_file(path, JS_SOURCE)
+        monkeypatch.setattr(TreeSitterAdapter, "_parse_tree",
+                            lambda *args, **kwargs: pytest.fail("cache miss"))
+        second = TreeSitterAdapter().parse_file(path, JS_SOURCE)
+
+        assert list(tmp_path.rglob("*.pkl"))
+        assert second.model_dump() == first.model_dump()
@@ -0,0 +1,70 @@
+"""
+Tests for the universal analyzer.
+=================================
+
+Covers directory analysis through UniversalAnalyzer.analyze_directory.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.ast_viewer.analyzers.universal import UniversalAnalyzer
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    """A small project with a few Python modules and an unsupported file."""
+    (tmp_path / "pkg").mkdir()
+    for i in range(3):
+        (tmp_path / f"mod_{i}.py").write_text(f"def func_{i}():\n    return {i}\n")
+    (tmp_path / "pkg" / "util.js").write_text("export function util() { return 1; }\n")
+    (tmp_path / "notes.txt").write_text("not code\n")
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestUniversalAnalyzerAnalyzeDirectory:
+    """Behaviour of UniversalAnalyzer.analyze_directory."""
+
+    def test_analyze_directory_should_match_serial_analysis_across_workers(self, project_dir, monkeypatch):
+        monkeypatch.setattr("src.ast_viewer.analyzers.universal._PARALLEL_ANALYZE_MIN_FILES", 0)
+        analyzer = UniversalAnalyzer()
+
+        parallel = analyzer.analyze_directory(project_dir, workers=2)
+        serial = UniversalAnalyzer().analyze_directory(project_dir, workers=1)
+
+        assert list(parallel) == list(serial)
+        assert sorted(Path(path).name for path in parallel) == ["mod_0.py", "mod_1.py", "mod_2.py", "util.js"]
+        assert all(parallel[path].model_dump() == serial[path].model_dump() for path in parallel)
+
+    def test_analyze_directory_should_cache_results_from_workers(self, project_dir, monkeypatch):
+        monkeypatch.setattr("src.ast_viewer.analyzers.universal._PARALLEL_ANALYZE_MIN_FILES", 0)
+        analyzer = UniversalAnalyzer()
+
+        results = analyzer.analyze_directory(project_dir, workers=2)
+
+        assert analyzer._file_cache.keys() == results.keys()
+        assert results[str(project_dir / "mod_1.py")].metadata["language_detected"] == "python"
+
+    def test_analyze_directory_should_not_start_pool_for_small_batches(self, project_dir, monkeypatch):
+        monkeypatch.setattr("src.ast_viewer.analyzers.universal.ProcessPoolExecutor",
+                            lambda *args, **kwargs: pytest.fail("process pool started"))
+
+        results = UniversalAnalyzer().analyze_directory(project_dir, workers=4)
+
+        assert len(results) == 4
+
+    def test_discover_files_should_skip_excluded_directories_in_rglob_order(self, project_dir):
+        (project_dir / "node_modules" / "dep").mkdir(parents=True)
+        (project_dir / "node_modules" / "dep" / "index.js").write_text("module.exports = 1;\n")
+        (project_dir / "pkg" / "__pycache__").mkdir()
+        (project_dir / "pkg" / "__pycache__" / "util.py").write_text("x = 1\n")
+
+        discovered = UniversalAnalyzer().discover_files(project_dir)
+        expected = [path for path in project_dir.rglob("*")
+                    if path.suffix in {".py", ".js"} and "node_modules" not in path.parts
+                    and "__pycache__" not in path.parts]
+
+        assert discovered == expected
+        assert len(discovered) == 4